@@ -15,7 +15,8 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from referral_crm.models import init_db, session_scope, ICD10Code, ProcedureCode
+from referral_crm.models import init_db, session_scope, bulk_upsert
+from referral_crm.models import DimICD10 as ICD10Code, DimProcedureCode as ProcedureCode
 from referral_crm.services.reference_data import ReferenceDataService
 
 
@@ -128,48 +129,35 @@ SAMPLE_PROCEDURE_CODES = [
 
 def load_sample_icd10(session):
     """Load sample ICD-10 codes into database."""
-    count = 0
-    for code, description, category, body_region in SAMPLE_ICD10_CODES:
-        existing = session.query(ICD10Code).filter(ICD10Code.code == code).first()
-        if existing:
-            existing.description = description
-            existing.category = category
-            existing.body_region = body_region
-            existing.is_active = True
-        else:
-            icd10 = ICD10Code(
-                code=code,
-                description=description,
-                category=category,
-                body_region=body_region,
-            )
-            session.add(icd10)
-        count += 1
+    rows = [
+        {
+            "code": code,
+            "description": description,
+            "category": category,
+            "body_region": body_region,
+            "is_active": True,
+        }
+        for code, description, category, body_region in SAMPLE_ICD10_CODES
+    ]
+    count = bulk_upsert(session, ICD10Code, rows, index_elements=["code"])
     session.commit()
     return count
 
 
 def load_sample_procedures(session):
     """Load sample procedure codes into database."""
-    count = 0
-    for code, description, service_type, modality, body_region in SAMPLE_PROCEDURE_CODES:
-        existing = session.query(ProcedureCode).filter(ProcedureCode.code == code).first()
-        if existing:
-            existing.description = description
-            existing.service_type = service_type
-            existing.modality = modality
-            existing.body_region = body_region
-            existing.is_active = True
-        else:
-            proc = ProcedureCode(
-                code=code,
-                description=description,
-                service_type=service_type,
-                modality=modality,
-                body_region=body_region,
-            )
-            session.add(proc)
-        count += 1
+    rows = [
+        {
+            "code": code,
+            "description": description,
+            "service_type": service_type,
+            "modality": modality,
+            "body_region": body_region,
+            "is_active": True,
+        }
+        for code, description, service_type, modality, body_region in SAMPLE_PROCEDURE_CODES
+    ]
+    count = bulk_upsert(session, ProcedureCode, rows, index_elements=["code"])
     session.commit()
     return count
 
@@ -15,13 +15,14 @@ import uuid
 from fastapi import FastAPI, BackgroundTasks, Depends, File, HTTPException, Query, Request, UploadFile, Header, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from referral_crm.config import get_settings
-from referral_crm.models import init_db, get_session, ReferralStatus, Priority, QueueType
+from referral_crm.models import init_db, get_session, session_scope, ReferralStatus, Priority, QueueType
+from referral_crm.models.referral import NOTES_MAX_LENGTH
 from referral_crm.services.referral_service import ReferralService, CarrierService
 from referral_crm.services.provider_service import ProviderService
 from referral_crm.services.storage_service import get_storage_service
@@ -155,13 +156,13 @@ class ReferralBase(BaseModel):
 class ReferralCreate(ReferralBase):
     """Schema for creating a referral."""
 
-    pass
+    notes: Optional[str] = Field(None, max_length=NOTES_MAX_LENGTH)
 
 
 class ReferralUpdate(ReferralBase):
     """Schema for updating a referral."""
 
-    pass
+    notes: Optional[str] = Field(None, max_length=NOTES_MAX_LENGTH)
 
 
 class ReferralResponse(ReferralBase):
@@ -196,7 +197,7 @@ class StatusUpdate(BaseModel):
     """Schema for status update."""
 
     status: str
-    notes: Optional[str] = None
+    notes: Optional[str] = Field(None, max_length=NOTES_MAX_LENGTH)
 
 
 class ProviderAssignment(BaseModel):
@@ -357,11 +358,32 @@ class SetRxAttachmentRequest(BaseModel):
 # ============================================================================
 # Application Setup
 # ============================================================================
+def warm_statement_cache() -> None:
+    """
+    Run the hottest read queries once at startup.
+
+    Configures the mappers and puts the compiled dashboard, referral list
+    and queue statistics statements in the engine's cache, so the first
+    requests don't pay for compilation.
+    """
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+    with session_scope() as session:
+        service = ReferralService(session)
+        service.count_by_status()
+        service.list(limit=1)
+        workflow = WorkflowService(session)
+        for queue_type in QueueType:
+            workflow.get_queue_stats(queue_type)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    # Startup: Initialize database
+    # Startup: Initialize database and warm the statement cache
     init_db()
+    warm_statement_cache()
     yield
     # Shutdown: cleanup if needed
 
@@ -376,6 +398,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         lifespan=lifespan,
         dependencies=[Depends(verify_credentials)],  # Require auth on all routes
+        default_response_class=ORJSONResponse,  # orjson instead of stdlib json for API bodies
     )
 
     # CORS middleware
@@ -679,6 +702,7 @@ def get_referral_history(
             "field_name": log.field_name,
             "old_value": log.old_value,
             "new_value": log.new_value,
+            "changes": log.changes,
             "user": log.user,
             "timestamp": log.timestamp.isoformat(),
             "notes": log.notes,
@@ -1077,7 +1101,7 @@ def serve_review_page(
 
     # Build attachment data with URLs (attachments are now on Email)
     attachments = []
-    email_attachments = referral.source_email.attachments if referral.source_email else []
+    email_attachments = service.get_attachments(referral)
     for att in email_attachments:
         if att.filename and att.filename.lower().endswith(".png"):
             continue
@@ -1087,7 +1111,8 @@ def serve_review_page(
             "content_type": att.content_type,
             "size_bytes": att.size_bytes or 0,
             "document_type": att.document_type.value if att.document_type else None,
-            "extracted_text": att.extracted_text,
+            # The text itself is fetched when it is first shown (see get_attachment_text)
+            "has_extracted_text": att.has_extracted_text,
             "view_url": None,
             "download_url": None,
             "text_url": None,
@@ -1160,7 +1185,7 @@ def list_referral_attachments(
     attachments = []
 
     # Attachments are now on Email, not Referral
-    email_attachments = referral.source_email.attachments if referral.source_email else []
+    email_attachments = service.get_attachments(referral)
     for att in email_attachments:
         att_data = {
             "id": att.id,
@@ -1168,7 +1193,7 @@ def list_referral_attachments(
             "content_type": att.content_type,
             "size_bytes": att.size_bytes,
             "document_type": att.document_type.value if att.document_type else None,
-            "has_extracted_text": bool(att.extracted_text),
+            "has_extracted_text": att.has_extracted_text,
         }
 
         # Add S3 URLs if configured
@@ -1248,6 +1273,7 @@ def list_queue_items(
             pass
 
     result = []
+    now = datetime.utcnow()  # Same reference time for every item's SLA fields
     for item in items:
         referral = item.referral
         patient_name = None
@@ -1271,8 +1297,8 @@ def list_queue_items(
             assigned_to=item.assigned_to,
             entered_queue_at=item.entered_queue_at,
             due_at=item.due_at,
-            is_overdue=item.is_overdue,
-            wait_time_minutes=item.wait_time_minutes,
+            is_overdue=item.is_overdue_at(now),
+            wait_time_minutes=item.wait_time_minutes_at(now),
             patient_name=patient_name or None,
             claim_number=claim_number,
             carrier_name=carrier_name,
@@ -1496,7 +1522,7 @@ def list_all_referral_attachments(
 
     # Get attachments from source email
     if referral.source_email:
-        for att in referral.source_email.attachments:
+        for att in referral_service.get_attachments(referral):
             if att.filename and att.filename.lower().endswith(".png"):
                 continue  # Skip inline images
             att_data = AttachmentResponse(
@@ -1513,7 +1539,7 @@ def list_all_referral_attachments(
             attachments.append(att_data)
 
     # Get directly uploaded attachments
-    for att in referral.uploaded_attachments:
+    for att in referral_service.get_uploaded_attachments(referral_id):
         att_data = AttachmentResponse(
             id=att.id,
             filename=att.filename,
@@ -1530,6 +1556,33 @@ def list_all_referral_attachments(
     return attachments
 
 
+@app.get("/api/referrals/{referral_id}/attachments/{attachment_id}/text")
+def get_attachment_text(
+    referral_id: int,
+    attachment_id: int,
+    referral_service: ReferralService = Depends(get_referral_service),
+):
+    """Get an attachment's extracted text as plain text (from the row or S3)."""
+    referral = referral_service.get(referral_id)
+    if not referral:
+        raise HTTPException(404, "Referral not found")
+
+    from referral_crm.models import Attachment
+    attachment = referral_service.session.get(Attachment, attachment_id)
+    if not attachment or (
+        attachment.referral_id != referral_id
+        and (not attachment.email_id or attachment.email_id != referral.email_id)
+    ):
+        raise HTTPException(404, "Attachment not found")
+
+    if not attachment.has_extracted_text:
+        raise HTTPException(404, "No extracted text for this attachment")
+    text = attachment.extracted_text
+    if text is None:
+        raise HTTPException(502, "Could not fetch the extracted text from storage")
+    return Response(content=text, media_type="text/plain; charset=utf-8")
+
+
 @app.post("/api/referrals/{referral_id}/attachments", response_model=AttachmentResponse)
 async def upload_attachment(
     referral_id: int,
@@ -1737,6 +1790,6 @@ def _parse_date(date_str: Optional[str]) -> Optional[datetime]:
     if not date_str:
         return None
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
+        return datetime.fromisoformat(date_str)
     except ValueError:
         return None
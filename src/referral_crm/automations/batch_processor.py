@@ -178,23 +178,20 @@ class BatchProcessor:
             referral_service = ReferralService(session)
 
             referrals = referral_service.list(status=from_status, limit=500)
+            stats["checked"] = len(referrals)
 
-            for referral in referrals:
-                stats["checked"] += 1
-
-                # Apply optional filter
-                if filter_fn and not filter_fn(referral):
-                    continue
+            # Apply optional filter
+            selected = [r for r in referrals if not filter_fn or filter_fn(r)]
 
-                if not dry_run:
-                    referral_service.update_status(
-                        referral.id,
-                        to_status,
-                        user="bulk_update",
-                        notes=f"Bulk update from {from_status.value} to {to_status.value}",
-                    )
+            if not dry_run:
+                referral_service.update_status_many(
+                    selected,
+                    to_status,
+                    user="bulk_update",
+                    notes=f"Bulk update from {from_status.value} to {to_status.value}",
+                )
 
-                stats["updated"] += 1
+            stats["updated"] = len(selected)
 
         action = "Would update" if dry_run else "Updated"
         console.print(f"\n[green]{action} {stats['updated']} referrals[/green]")
@@ -308,6 +305,30 @@ class BatchProcessor:
         console.print(f"\n[red]{action} {stats['deleted']} old referrals[/red]")
         return stats
 
+    def cleanup_queue_items(self, days_old: int = 30, dry_run: bool = True) -> dict:
+        """
+        Delete completed, skipped and failed queue items older than a threshold.
+
+        Args:
+            days_old: Age threshold in days (by completion time)
+            dry_run: If True, don't actually delete
+
+        Returns:
+            dict with statistics
+        """
+        from referral_crm.services.workflow_service import WorkflowService
+
+        cutoff = datetime.utcnow() - timedelta(days=days_old)
+
+        console.print(f"[yellow]Checking for finished queue items older than {days_old} days[/yellow]")
+
+        with session_scope() as session:
+            deleted = WorkflowService(session).purge_finished_items(cutoff, dry_run=dry_run)
+
+        action = "Would delete" if dry_run else "Deleted"
+        console.print(f"\n[red]{action} {deleted} finished queue items[/red]")
+        return {"deleted": deleted}
+
 
 class WorkflowAutomation:
     """
@@ -8,6 +8,7 @@ Updated to use the new normalized schema:
 """
 
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import tempfile
 from pathlib import Path
@@ -15,14 +16,17 @@ from typing import Optional
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from sqlalchemy import exists
 
-from referral_crm.config import get_settings
+from referral_crm.config import get_integrations_settings, get_settings
 from referral_crm.models import (
+    insert_if_absent,
     session_scope,
     Email,
     EmailStatus,
     Attachment,
     ExtractionResult,
+    QueueItem,
     Referral,
     ReferralStatus,
     ReferralLineItem,
@@ -67,14 +71,21 @@ class EmailIngestionPipeline:
         extract_attachments: bool = True,
         use_llm: bool = True,
         log_callback: Optional[callable] = None,
+        max_workers: int = 4,
+        quiet: bool = False,
     ):
         self.settings = get_settings()
+        self.integrations = get_integrations_settings()
         self.email_service = EmailService()
+        self.storage = get_storage_service()
         self.extraction_service = ExtractionService() if use_llm else None
         self.mark_as_read = mark_as_read
         self.extract_attachments = extract_attachments
         self.use_llm = use_llm
         self.log_callback = log_callback
+        self.max_workers = max_workers
+        # Skip console rendering entirely (batch/daemon runs)
+        self.quiet = quiet
 
     def _log(self, message: str):
         """Log a message to console and callback if available."""
@@ -86,7 +97,12 @@ class EmailIngestionPipeline:
                                .replace("[bold]", "").replace("[/bold]", "")
         if self.log_callback:
             self.log_callback(plain_message)
-        console.print(message)
+        self._print(message)
+
+    def _print(self, message: str):
+        """Print a message to the console unless running quietly."""
+        if not self.quiet:
+            console.print(message)
 
     def run(
         self,
@@ -129,7 +145,7 @@ class EmailIngestionPipeline:
                 folder=self.settings.email_inbox_folder,
                 top=max_emails,
                 filter_query=filter_query,
-                mailbox=self.settings.shared_mailbox or self.settings.graph_mailbox,
+                mailbox=self.integrations.shared_mailbox or self.integrations.graph_mailbox,
             )
         except Exception as e:
             self._log(f"[red]Error fetching emails: {e}[/red]")
@@ -137,23 +153,30 @@ class EmailIngestionPipeline:
 
         self._log(f"Found {len(messages)} emails to process")
 
-        # Process each email
-        for i, message in enumerate(messages, 1):
-            try:
-                self._log(f"[{i}/{len(messages)}] Processing: {message.subject[:60]}...")
-                result = self._process_email(message)
-                stats["processed"] += 1
+        # Process emails concurrently. The work is dominated by Graph, LLM and
+        # S3 calls; each worker opens its own session in _process_email.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._process_email, message): message
+                for message in messages
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                message = futures[future]
+                try:
+                    result = future.result()
+                    self._log(f"[{i}/{len(messages)}] Processed: {message.subject[:60]}...")
+                    stats["processed"] += 1
 
-                if result == "created":
-                    stats["created"] += 1
-                    self._log(f"  -> Created new referral")
-                elif result == "skipped":
-                    stats["skipped"] += 1
-                    self._log(f"  -> Skipped (already processed)")
+                    if result == "created":
+                        stats["created"] += 1
+                        self._log(f"  -> Created new referral")
+                    elif result == "skipped":
+                        stats["skipped"] += 1
+                        self._log(f"  -> Skipped (already processed)")
 
-            except Exception as e:
-                self._log(f"[red]Error processing email: {e}[/red]")
-                stats["errors"] += 1
+                except Exception as e:
+                    self._log(f"[{i}/{len(messages)}] [red]Error processing {message.subject[:60]}: {e}[/red]")
+                    stats["errors"] += 1
 
         self._log(f"[green]Ingestion complete:[/green] "
                   f"{stats['created']} created, "
@@ -175,32 +198,46 @@ class EmailIngestionPipeline:
             line_item_service = LineItemService(session)
             carrier_service = CarrierService(session)
 
-            # Check if already processed (by graph_id)
-            existing_email = session.query(Email).filter(
-                Email.graph_id == message.id
-            ).first()
-            if existing_email:
-                return "skipped"
-
             # ================================================================
-            # STEP 1: Create Email record
+            # STEP 1: Create Email record (skipped if already processed,
+            # by graph_id, in the same statement)
             # ================================================================
-            email = Email(
-                graph_id=message.id,
-                internet_message_id=message.internet_message_id,
-                conversation_id=message.conversation_id,
-                web_link=message.web_link,
-                subject=message.subject,
-                from_email=message.from_email,
-                from_name=message.from_name,
-                body_preview=message.body_preview,
-                body_html=message.body_content,
-                has_attachments=message.has_attachments,
-                received_at=message.received_datetime,
-                status=EmailStatus.RECEIVED,
+            email = insert_if_absent(
+                session,
+                Email,
+                dict(
+                    graph_id=message.id,
+                    internet_message_id=message.internet_message_id,
+                    conversation_id=message.conversation_id,
+                    web_link=message.web_link,
+                    subject=message.subject,
+                    from_email=message.from_email,
+                    from_name=message.from_name,
+                    body_preview=message.body_preview,
+                    body_html=message.body_content,
+                    has_attachments=message.has_attachments,
+                    received_at=message.received_datetime,
+                    status=EmailStatus.RECEIVED,
+                ),
+                index_elements=["graph_id"],
             )
-            session.add(email)
-            session.flush()  # Get email.id
+            if email is None:
+                # A run that failed before queueing left the email RECEIVED
+                # with no queue item; resume it rather than skip it for good
+                email = (
+                    session.query(Email)
+                    .filter(
+                        Email.graph_id == message.id,
+                        Email.status == EmailStatus.RECEIVED,
+                        ~exists().where(QueueItem.email_id == Email.id),
+                    )
+                    .first()
+                )
+                if email is None:
+                    return "skipped"
+            # Commit (not just flush) so the SQLite write lock is not held
+            # while attachments download and other workers can write
+            session.commit()
 
             # ================================================================
             # STEP 2: Download and save attachments to Email
@@ -241,13 +278,13 @@ class EmailIngestionPipeline:
                         field_confidences={
                             k: v.get("confidence", 0) for k, v in extraction_data.items()
                         },
-                        model_used=self.settings.claude_model,
+                        model_used=self.integrations.claude_model,
                         extraction_duration_ms=duration_ms,
                     )
                     session.add(extraction_result)
 
                 except Exception as e:
-                    console.print(f"    [yellow]Extraction warning: {e}[/yellow]")
+                    self._print(f"    [yellow]Extraction warning: {e}[/yellow]")
                     workflow_service.fail_extraction(email, str(e))
                     return "created"  # Email created but extraction failed
 
@@ -415,12 +452,12 @@ class EmailIngestionPipeline:
                 try:
                     self.email_service.mark_as_read(
                         message.id,
-                        mailbox=self.settings.shared_mailbox or self.settings.graph_mailbox,
+                        mailbox=self.integrations.shared_mailbox or self.integrations.graph_mailbox,
                     )
                 except Exception:
                     pass  # Non-critical
 
-            console.print(f"    [green]Created referral #{referral.id} with {len(line_items)} line item(s)[/green]")
+            self._print(f"    [green]Created referral #{referral.id} with {len(line_items)} line item(s)[/green]")
             return "created"
 
     def _save_attachments_to_email(
@@ -433,7 +470,7 @@ class EmailIngestionPipeline:
         Download and save attachments to the Email record.
         Returns list of extracted text from documents.
         """
-        storage = get_storage_service()
+        storage = self.storage
         s3_enabled = storage.is_configured()
         texts = []
 
@@ -445,15 +482,16 @@ class EmailIngestionPipeline:
         }
 
         try:
+            mailbox = self.integrations.shared_mailbox or self.integrations.graph_mailbox
+            # Metadata only; each file is streamed from $value to disk below
             attachments = self.email_service.get_attachments(
-                message_id,
-                mailbox=self.settings.shared_mailbox or self.settings.graph_mailbox,
+                message_id, mailbox=mailbox, include_content=False
             )
             attachments_dir = self.settings.attachments_dir / str(email.id)
             attachments_dir.mkdir(parents=True, exist_ok=True)
 
             for att in attachments:
-                if att.content_bytes:
+                if att.size:
                     filename_lower = att.name.lower()
                     extension = Path(filename_lower).suffix
                     is_logo = (
@@ -462,8 +500,14 @@ class EmailIngestionPipeline:
                     )
 
                     # Save locally
-                    filepath = attachments_dir / att.name
-                    filepath.write_bytes(att.content_bytes)
+                    filepath = self.email_service.save_attachment_streaming(
+                        message_id,
+                        att.id,
+                        attachments_dir,
+                        att.name,
+                        mailbox=mailbox,
+                        size=att.size,
+                    )
 
                     # Determine document type and extract text
                     extracted_text = None
@@ -487,17 +531,19 @@ class EmailIngestionPipeline:
                     s3_text_key = None
                     if s3_enabled:
                         try:
-                            s3_result = storage.upload_attachment(
-                                referral_id=email.id,  # Using email.id for now
-                                filename=att.name,
-                                content=att.content_bytes,
-                                content_type=att.content_type,
-                                extracted_text=extracted_text,
-                            )
+                            # Stream from disk; the file is never read into memory
+                            with filepath.open("rb") as f:
+                                s3_result = storage.upload_attachment_fileobj(
+                                    referral_id=email.id,  # Using email.id for now
+                                    filename=att.name,
+                                    fileobj=f,
+                                    content_type=att.content_type,
+                                    extracted_text=extracted_text,
+                                )
                             s3_key = s3_result.get("s3_key")
                             s3_text_key = s3_result.get("text_s3_key")
                         except Exception as e:
-                            console.print(f"    [yellow]S3 upload warning: {e}[/yellow]")
+                            self._print(f"    [yellow]S3 upload warning: {e}[/yellow]")
 
                     # Create Attachment record linked to Email
                     attachment = Attachment(
@@ -510,16 +556,17 @@ class EmailIngestionPipeline:
                         s3_key=s3_key,
                         s3_text_key=s3_text_key,
                         document_type=doc_type,
-                        extracted_text=extracted_text,
+                        # Text uploaded to S3 is read back from there
+                        extracted_text=None if s3_text_key else extracted_text,
                         is_relevant=not is_logo,
                     )
                     session.add(attachment)
 
             if attachments:
-                console.print(f"    [dim]Saved {len(attachments)} attachment(s)[/dim]")
+                self._print(f"    [dim]Saved {len(attachments)} attachment(s)[/dim]")
 
         except Exception as e:
-            console.print(f"    [yellow]Warning: Could not save attachments: {e}[/yellow]")
+            self._print(f"    [yellow]Warning: Could not save attachments: {e}[/yellow]")
 
         return texts
 
@@ -530,7 +577,7 @@ class EmailIngestionPipeline:
         extraction_data: dict,
     ) -> None:
         """Upload email and extraction data to S3."""
-        storage = get_storage_service()
+        storage = self.storage
         if not storage.is_configured():
             return
 
@@ -566,10 +613,10 @@ class EmailIngestionPipeline:
                 )
                 email.s3_extraction_key = extraction_key
 
-            console.print(f"    [dim]Uploaded to S3[/dim]")
+            self._print(f"    [dim]Uploaded to S3[/dim]")
 
         except Exception as e:
-            console.print(f"    [yellow]S3 upload warning: {e}[/yellow]")
+            self._print(f"    [yellow]S3 upload warning: {e}[/yellow]")
 
     def _get_extracted_value(self, data: dict, field: str) -> Optional[str]:
         """Get a value from extraction data."""
@@ -582,7 +629,7 @@ class EmailIngestionPipeline:
         if not date_str:
             return None
         try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
+            return datetime.fromisoformat(date_str)
         except ValueError:
             return None
 
@@ -636,6 +683,8 @@ def run_ingestion(
     since_hours: int = 24,
     mark_as_read: bool = True,
     use_llm: bool = True,
+    max_workers: int = 4,
+    quiet: bool = False,
 ):
     """
     Convenience function to run a single ingestion pass.
@@ -644,5 +693,7 @@ def run_ingestion(
     pipeline = EmailIngestionPipeline(
         mark_as_read=mark_as_read,
         use_llm=use_llm,
+        max_workers=max_workers,
+        quiet=quiet,
     )
     return pipeline.run(max_emails=max_emails, since_hours=since_hours)
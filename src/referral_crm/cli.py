@@ -3,6 +3,7 @@ CLI interface for Referral CRM.
 Uses Typer for commands and Rich for beautiful output.
 """
 
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -15,10 +16,7 @@ from rich.prompt import Confirm, Prompt
 from rich.table import Table
 from rich.text import Text
 
-from referral_crm.config import get_settings
-from referral_crm.models import init_db, session_scope, ReferralStatus, Priority
-from referral_crm.services.referral_service import ReferralService, CarrierService
-from referral_crm.services.provider_service import ProviderService, RateService
+from referral_crm.config import get_integrations_settings, get_settings
 
 app = typer.Typer(
     name="referral-crm",
@@ -28,13 +26,14 @@ app = typer.Typer(
 
 console = Console()
 
-
 # ============================================================================
 # Database Commands
 # ============================================================================
 @app.command("init")
 def init_database():
     """Initialize the database (creates tables if they don't exist)."""
+    from referral_crm.models import init_db
+
     settings = get_settings()
     console.print(f"[blue]Initializing database:[/blue] {settings.database_url}")
     init_db()
@@ -44,13 +43,17 @@ def init_database():
 @app.command("status")
 def show_status():
     """Show CRM status and statistics."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.referral_service import ReferralService
+
     settings = get_settings()
+    integrations = get_integrations_settings()
 
     console.print(Panel.fit(
         f"[bold]Referral CRM[/bold]\n"
         f"Database: {settings.get_db_path()}\n"
-        f"Graph API: {'[green]Configured[/green]' if settings.graph_client_id else '[yellow]Not configured[/yellow]'}\n"
-        f"Claude API: {'[green]Configured[/green]' if settings.anthropic_api_key else '[yellow]Not configured[/yellow]'}",
+        f"Graph API: {'[green]Configured[/green]' if integrations.graph_client_id else '[yellow]Not configured[/yellow]'}\n"
+        f"Claude API: {'[green]Configured[/green]' if integrations.anthropic_api_key else '[yellow]Not configured[/yellow]'}",
         title="System Status",
         border_style="blue",
     ))
@@ -90,6 +93,9 @@ def list_referrals(
     limit: int = typer.Option(20, "--limit", "-n", help="Number of results"),
 ):
     """List referrals with optional filtering."""
+    from referral_crm.models import session_scope, ReferralStatus, Priority
+    from referral_crm.services.referral_service import ReferralService
+
     with session_scope() as session:
         service = ReferralService(session)
 
@@ -168,6 +174,9 @@ def show_referral(
     referral_id: int = typer.Argument(..., help="Referral ID to show"),
 ):
     """Show detailed information about a referral."""
+    from referral_crm.models import session_scope, ReferralStatus
+    from referral_crm.services.referral_service import ReferralService
+
     with session_scope() as session:
         service = ReferralService(session)
         referral = service.get(referral_id)
@@ -233,9 +242,10 @@ def show_referral(
             console.print()
 
         # Attachments
-        if referral.attachments:
+        attachments = service.get_attachments(referral)
+        if attachments:
             console.print("[bold cyan]Attachments[/bold cyan]")
-            for att in referral.attachments:
+            for att in attachments:
                 console.print(f"  - {att.filename} ({att.document_type or 'Unknown type'})")
             console.print()
 
@@ -253,6 +263,9 @@ def show_referral(
 @referral_app.command("create")
 def create_referral():
     """Create a new referral interactively."""
+    from referral_crm.models import session_scope, Priority
+    from referral_crm.services.referral_service import ReferralService, CarrierService
+
     console.print("[bold]Create New Referral[/bold]")
     console.print()
 
@@ -301,10 +314,13 @@ def update_referral_status(
     notes: Optional[str] = typer.Option(None, "--notes", "-n", help="Status change notes"),
 ):
     """Update the status of a referral."""
+    from referral_crm.models import session_scope, ReferralStatus
+    from referral_crm.services.referral_service import ReferralService
+
     try:
         new_status = ReferralStatus(status.lower())
     except ValueError:
-        valid = ", ".join([s.value for s in ReferralStatus])
+        valid = ", ".join(ReferralStatus.values())
         console.print(f"[red]Invalid status. Valid options: {valid}[/red]")
         raise typer.Exit(1)
 
@@ -324,6 +340,9 @@ def approve_referral(
     referral_id: int = typer.Argument(..., help="Referral ID to approve"),
 ):
     """Approve a referral."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.referral_service import ReferralService
+
     with session_scope() as session:
         service = ReferralService(session)
         referral = service.approve(referral_id)
@@ -341,6 +360,9 @@ def reject_referral(
     reason: str = typer.Argument(..., help="Rejection reason"),
 ):
     """Reject a referral with a reason."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.referral_service import ReferralService
+
     with session_scope() as session:
         service = ReferralService(session)
         referral = service.reject(referral_id, reason)
@@ -357,6 +379,9 @@ def show_referral_history(
     referral_id: int = typer.Argument(..., help="Referral ID"),
 ):
     """Show the audit history for a referral."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.referral_service import ReferralService
+
     with session_scope() as session:
         service = ReferralService(session)
         logs = service.get_audit_log(referral_id)
@@ -396,6 +421,9 @@ app.add_typer(carrier_app, name="carrier")
 @carrier_app.command("list")
 def list_carriers():
     """List all carriers."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.referral_service import CarrierService
+
     with session_scope() as session:
         service = CarrierService(session)
         carriers = service.list(active_only=False)
@@ -428,6 +456,9 @@ def create_carrier(
     code: Optional[str] = typer.Option(None, "--code", "-c", help="Short code"),
 ):
     """Create a new carrier."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.referral_service import CarrierService
+
     with session_scope() as session:
         service = CarrierService(session)
         carrier = service.create(name=name, code=code)
@@ -448,6 +479,9 @@ def list_providers(
     limit: int = typer.Option(50, "--limit", "-n", help="Number of results"),
 ):
     """List providers with optional filtering."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.provider_service import ProviderService
+
     with session_scope() as session:
         service = ProviderService(session)
         providers = service.list(
@@ -492,6 +526,9 @@ def create_provider(
     phone: Optional[str] = typer.Option(None, "--phone", help="Phone number"),
 ):
     """Create a new provider."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.provider_service import ProviderService
+
     with session_scope() as session:
         service = ProviderService(session)
         provider = service.create(
@@ -510,6 +547,9 @@ def find_providers(
     zip_code: Optional[str] = typer.Option(None, "--zip", help="Claimant ZIP code"),
 ):
     """Find matching providers for a service type."""
+    from referral_crm.models import session_scope
+    from referral_crm.services.provider_service import ProviderService
+
     with session_scope() as session:
         service = ProviderService(session)
         matches = service.find_matching_providers(
@@ -556,9 +596,9 @@ def import_sample_email(
     """Pull sample email data from the shared mailbox (first email in a chain)."""
     from referral_crm.services.email_service import EmailService
 
-    settings = get_settings()
+    integrations = get_integrations_settings()
 
-    if not settings.shared_mailbox:
+    if not integrations.shared_mailbox:
         console.print("[red]SHARED_MAILBOX environment variable not set.[/red]")
         console.print("[dim]Set it in your .env file or environment.[/dim]")
         raise typer.Exit(1)
@@ -570,14 +610,14 @@ def import_sample_email(
         console.print("[dim]Set GRAPH_CLIENT_ID, GRAPH_CLIENT_SECRET, and GRAPH_TENANT_ID.[/dim]")
         raise typer.Exit(1)
 
-    console.print(f"[blue]Fetching from:[/blue] {settings.shared_mailbox}")
+    console.print(f"[blue]Fetching from:[/blue] {integrations.shared_mailbox}")
     console.print(f"[blue]Folder:[/blue] {folder}")
     console.print()
 
     with console.status("Fetching emails..."):
         try:
             messages = email_service.list_messages_from_shared_mailbox(
-                mailbox=settings.shared_mailbox,
+                mailbox=integrations.shared_mailbox,
                 folder_path=folder,
                 top=1,
             )
@@ -597,8 +637,9 @@ def import_sample_email(
         try:
             first_message = email_service.get_first_message_in_chain(
                 message,
-                mailbox=settings.shared_mailbox,
+                mailbox=integrations.shared_mailbox,
                 folder_path=folder,
+                include_body=False,
             )
         except Exception as e:
             console.print(f"[yellow]Could not get chain, using current message: {e}[/yellow]")
@@ -631,7 +672,7 @@ def import_sample_email(
             try:
                 attachments = email_service.get_attachments_from_shared_mailbox(
                     first_message.id,
-                    settings.shared_mailbox,
+                    integrations.shared_mailbox,
                 )
                 console.print(f"[cyan]Attachments ({len(attachments)}):[/cyan]")
                 for att in attachments:
@@ -654,13 +695,17 @@ def import_sample_referral(
 ):
     """Fetch a sample email from shared mailbox and create a referral in the database."""
     from pathlib import Path
+    from referral_crm.models import session_scope, Priority
     from referral_crm.services.email_service import EmailService, EmailMessage
     from referral_crm.services.referral_service import ReferralService, CarrierService
+    from referral_crm.services.storage_service import get_storage_service
 
     settings = get_settings()
+    integrations = get_integrations_settings()
+    storage = get_storage_service()
 
     # Validate configuration
-    if not settings.shared_mailbox:
+    if not integrations.shared_mailbox:
         console.print("[red]SHARED_MAILBOX environment variable not set.[/red]")
         raise typer.Exit(1)
 
@@ -671,7 +716,7 @@ def import_sample_referral(
 
     console.print(Panel.fit(
         "[bold]Sample Referral Import[/bold]\n"
-        f"Mailbox: {settings.shared_mailbox}\n"
+        f"Mailbox: {integrations.shared_mailbox}\n"
         f"Folder: {folder}\n"
         f"LLM Extraction: {'Yes' if use_llm else 'No'}",
         border_style="blue",
@@ -682,7 +727,7 @@ def import_sample_referral(
     with console.status("[bold blue]Step 1/4:[/bold blue] Fetching email from shared mailbox..."):
         try:
             messages = email_service.list_messages_from_shared_mailbox(
-                mailbox=settings.shared_mailbox,
+                mailbox=integrations.shared_mailbox,
                 folder_path=folder,
                 top=1,
             )
@@ -712,6 +757,22 @@ def import_sample_referral(
         else:
             message_id_for_db = message.id
 
+        # List attachments once; extraction and saving both work from this
+        attachments = []
+        if message.has_attachments and not skip_attachments:
+            try:
+                attachments = email_service.get_attachments_from_shared_mailbox(
+                    message.id,
+                    integrations.shared_mailbox,
+                    include_content=False,
+                )
+            except Exception as e:
+                console.print(f"[yellow]! Error listing attachments: {e}[/yellow]")
+
+        # Attachments downloaded for extraction, moved into place when saving
+        staging_dir = Path(settings.attachments_dir) / "temp"
+        staged = {}
+
         # Step 3: Extract data with LLM (optional)
         extraction_data = {}
         if use_llm:
@@ -722,23 +783,28 @@ def import_sample_referral(
 
                     # Get attachment texts for better extraction
                     attachment_texts = []
-                    if message.has_attachments and not skip_attachments:
+                    if attachments:
                         try:
                             from referral_crm.services.extraction_service import extract_text_from_pdf
-                            attachments = email_service.get_attachments_from_shared_mailbox(
-                                message.id,
-                                settings.shared_mailbox,
-                            )
+                            staging_dir.mkdir(parents=True, exist_ok=True)
                             for att in attachments:
-                                if att.content_bytes and att.name.lower().endswith('.pdf'):
-                                    # Save temp and extract
-                                    temp_path = Path(settings.attachments_dir) / "temp" / att.name
-                                    temp_path.parent.mkdir(parents=True, exist_ok=True)
-                                    temp_path.write_bytes(att.content_bytes)
+                                if (
+                                    att.content_type == "application/pdf"
+                                    or os.path.splitext(att.name)[1].lower() == ".pdf"
+                                ):
+                                    # Download once and keep it for the save step
+                                    temp_path = email_service.save_attachment_streaming(
+                                        message.id,
+                                        att.id,
+                                        staging_dir,
+                                        att.name,
+                                        mailbox=integrations.shared_mailbox,
+                                        size=att.size,
+                                    )
+                                    staged[att.id] = temp_path
                                     text = extract_text_from_pdf(str(temp_path))
                                     if text:
                                         attachment_texts.append(text)
-                                    temp_path.unlink(missing_ok=True)
                         except Exception as e:
                             console.print(f"[yellow]  Warning extracting attachments: {e}[/yellow]")
 
@@ -776,9 +842,9 @@ def import_sample_referral(
             date_of_injury = None
             try:
                 if get_value("claimant_dob"):
-                    claimant_dob = datetime.strptime(get_value("claimant_dob"), "%Y-%m-%d")
+                    claimant_dob = datetime.fromisoformat(get_value("claimant_dob"))
                 if get_value("date_of_injury"):
-                    date_of_injury = datetime.strptime(get_value("date_of_injury"), "%Y-%m-%d")
+                    date_of_injury = datetime.fromisoformat(get_value("date_of_injury"))
             except ValueError:
                 pass
 
@@ -831,8 +897,6 @@ def import_sample_referral(
             console.print(f"[green]OK[/green] Created Referral #{referral.id}")
 
             # Upload email to S3 if configured
-            from referral_crm.services.storage_service import get_storage_service
-            storage = get_storage_service()
             if storage.is_configured():
                 try:
                     email_metadata = {
@@ -859,66 +923,66 @@ def import_sample_referral(
                     console.print(f"[yellow]! S3 email upload failed: {e}[/yellow]")
 
         # Step 5: Save attachments (local + S3)
-        if message.has_attachments and not skip_attachments:
+        if attachments:
             with console.status("[bold blue]Step 4/4:[/bold blue] Downloading attachments..."):
                 try:
-                    from referral_crm.services.storage_service import get_storage_service
-
-                    attachments = email_service.get_attachments_from_shared_mailbox(
-                        message.id,
-                        settings.shared_mailbox,
-                    )
                     attachments_dir = Path(settings.attachments_dir) / str(referral.id)
                     attachments_dir.mkdir(parents=True, exist_ok=True)
 
                     # Check if S3 is configured
-                    storage = get_storage_service()
                     s3_enabled = storage.is_configured()
                     if s3_enabled:
                         console.print(f"[dim]  S3 bucket: {storage.bucket}[/dim]")
 
-                    saved_count = 0
+                    attachment_rows = []
                     s3_count = 0
                     for att in attachments:
-                        if att.content_bytes:
-                            # Save locally
-                            filepath = attachments_dir / att.name
-                            filepath.write_bytes(att.content_bytes)
-
-                            # Upload to S3 if configured
-                            s3_key = None
-                            s3_url = None
-                            if s3_enabled:
-                                try:
-                                    s3_result = storage.upload_attachment(
+                        filepath = attachments_dir / att.name
+                        staged_path = staged.pop(att.id, None)
+                        if staged_path is not None:
+                            # Already downloaded during extraction
+                            staged_path.replace(filepath)
+                        else:
+                            # Stream to local disk without buffering the whole file
+                            email_service.save_attachment_streaming(
+                                message.id,
+                                att.id,
+                                attachments_dir,
+                                att.name,
+                                mailbox=integrations.shared_mailbox,
+                                size=att.size,
+                            )
+
+                        # Upload to S3 if configured (multipart, from the saved file)
+                        s3_key = None
+                        s3_url = None
+                        if s3_enabled:
+                            try:
+                                with filepath.open("rb") as f:
+                                    s3_result = storage.upload_attachment_fileobj(
                                         referral_id=referral.id,
                                         filename=att.name,
-                                        content=att.content_bytes,
+                                        fileobj=f,
                                         content_type=att.content_type,
                                     )
-                                    s3_key = s3_result.get("s3_key")
-                                    # Generate a presigned URL (1 hour expiry)
-                                    s3_url = storage.get_attachment_url(
-                                        referral.id,
-                                        att.name,
-                                        expires_in=3600,
-                                    )
-                                    s3_count += 1
-                                except Exception as e:
-                                    console.print(f"[yellow]  S3 upload failed for {att.name}: {e}[/yellow]")
-
-                            # Add to database
-                            referral_service.add_attachment(
-                                referral_id=referral.id,
-                                filename=att.name,
-                                content_type=att.content_type,
-                                size_bytes=att.size,
-                                storage_path=str(filepath),
-                                graph_attachment_id=att.id,
-                                s3_key=s3_key,
-                            )
-                            saved_count += 1
-
+                                s3_key = s3_result.get("s3_key")
+                                # Generate a presigned URL (1 hour expiry)
+                                s3_url = storage.presign_key(s3_key, expires_in=3600)
+                                s3_count += 1
+                            except Exception as e:
+                                console.print(f"[yellow]  S3 upload failed for {att.name}: {e}[/yellow]")
+
+                        attachment_rows.append({
+                            "filename": att.name,
+                            "content_type": att.content_type,
+                            "size_bytes": att.size,
+                            "storage_path": str(filepath),
+                            "graph_attachment_id": att.id,
+                            "s3_key": s3_key,
+                        })
+
+                    # Add to database in one insert
+                    saved_count = referral_service.add_attachments(referral.id, attachment_rows)
                     console.print(f"[green]OK[/green] Saved {saved_count} attachment(s) locally")
                     if s3_enabled:
                         console.print(f"[green]OK[/green] Uploaded {s3_count} attachment(s) to S3")
@@ -927,6 +991,9 @@ def import_sample_referral(
         else:
             console.print("[dim]Step 4/4: Skipping attachments[/dim]")
 
+        for staged_path in staged.values():
+            staged_path.unlink(missing_ok=True)
+
         # Save data needed for summary before session closes
         referral_id = referral.id
         referral_claimant_name = referral.claimant_name
@@ -939,8 +1006,6 @@ def import_sample_referral(
     console.print()
 
     # Check S3 status for summary
-    from referral_crm.services.storage_service import get_storage_service
-    storage = get_storage_service()
     s3_status = "[green]Enabled[/green]" if storage.is_configured() else "[yellow]Not configured[/yellow]"
 
     console.print(Panel.fit(
@@ -967,7 +1032,7 @@ def import_sample_referral(
         # List attachment URLs
         s3_attachments = storage.list_attachments(referral_id)
         for att in s3_attachments[:3]:  # Show first 3
-            url = storage.get_attachment_url(referral_id, att["filename"], expires_in=3600)
+            url = storage.presign_key(att["s3_key"], expires_in=3600)
             if url:
                 console.print(f"  {att['filename']}: {url[:60]}...")
         if len(s3_attachments) > 3:
@@ -980,6 +1045,10 @@ def import_sample_referral(
 @import_app.command("demo-data")
 def import_demo_data():
     """Import demo/sample data for testing."""
+    from referral_crm.models import session_scope, ReferralStatus, Priority
+    from referral_crm.services.referral_service import ReferralService, CarrierService
+    from referral_crm.services.provider_service import ProviderService, RateService
+
     if not Confirm.ask("This will add sample data to the database. Continue?"):
         raise typer.Exit()
 
@@ -1067,6 +1136,9 @@ def import_demo_data():
 @app.command("dashboard")
 def show_dashboard():
     """Show an interactive queue dashboard."""
+    from referral_crm.models import session_scope, ReferralStatus, Priority
+    from referral_crm.services.referral_service import ReferralService
+
     with session_scope() as session:
         service = ReferralService(session)
 
@@ -1152,6 +1224,8 @@ def run_email_ingestion(
     since_hours: int = typer.Option(24, "--since", "-s", help="Process emails from last N hours"),
     no_mark_read: bool = typer.Option(False, "--no-mark-read", help="Don't mark emails as read"),
     no_llm: bool = typer.Option(False, "--no-llm", help="Skip LLM extraction"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Emails to process concurrently"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Only print the final summary"),
 ):
     """Run email ingestion pipeline."""
     from referral_crm.automations.email_ingestion import EmailIngestionPipeline
@@ -1159,18 +1233,25 @@ def run_email_ingestion(
     pipeline = EmailIngestionPipeline(
         mark_as_read=not no_mark_read,
         use_llm=not no_llm,
+        max_workers=workers,
+        quiet=quiet,
     )
-    pipeline.run(max_emails=max_emails, since_hours=since_hours)
+    stats = pipeline.run(max_emails=max_emails, since_hours=since_hours)
+    if quiet:
+        print(
+            f"{stats['created']} created, {stats['skipped']} skipped, {stats['errors']} errors"
+        )
 
 
 @auto_app.command("poll")
 def start_email_polling(
     interval: int = typer.Option(60, "--interval", "-i", help="Poll interval in seconds"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress per-email output"),
 ):
     """Start continuous email polling."""
-    from referral_crm.automations.email_ingestion import EmailPoller
+    from referral_crm.automations.email_ingestion import EmailIngestionPipeline, EmailPoller
 
-    poller = EmailPoller()
+    poller = EmailPoller(pipeline=EmailIngestionPipeline(quiet=quiet))
     poller.start(interval_seconds=interval)
 
 
@@ -1218,6 +1299,18 @@ def cleanup_old(
     processor.cleanup_old_referrals(days_old=days, dry_run=dry_run)
 
 
+@auto_app.command("cleanup-queues")
+def cleanup_queue_items(
+    days: int = typer.Option(30, "--days", "-d", help="Age threshold in days"),
+    dry_run: bool = typer.Option(True, "--dry-run/--execute", help="Dry run by default"),
+):
+    """Delete finished (completed/skipped/failed) queue items."""
+    from referral_crm.automations.batch_processor import BatchProcessor
+
+    processor = BatchProcessor()
+    processor.cleanup_queue_items(days_old=days, dry_run=dry_run)
+
+
 # ============================================================================
 # Server Commands
 # ============================================================================
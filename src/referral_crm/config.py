@@ -3,25 +3,51 @@ Configuration management for Referral CRM.
 Supports .env files and environment variables.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-class Settings(BaseSettings):
-    """Application settings with environment variable support."""
+# Every settings class reads the same .env file and unprefixed variable names
+_ENV_CONFIG = SettingsConfigDict(
+    env_file=".env",
+    env_file_encoding="utf-8",
+    extra="ignore",
+)
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore",
-    )
+
+class CoreSettings(BaseSettings):
+    """Database and application settings needed on every code path."""
+
+    model_config = _ENV_CONFIG
 
     # Database
     database_url: str = "sqlite:///referral_crm.db"
     database_echo: bool = False
 
+    # Application settings
+    app_name: str = "Referral CRM"
+    debug: bool = False
+    attachments_dir: Path = Path("./attachments")
+
+    # Email polling
+    email_poll_interval_seconds: int = 60
+    email_inbox_folder: str = "Inbox"
+
+    def get_db_path(self) -> Path:
+        """Extract the database file path from the URL."""
+        if self.database_url.startswith("sqlite:///"):
+            return Path(self.database_url.replace("sqlite:///", ""))
+        return Path("referral_crm.db")
+
+
+class IntegrationsSettings(BaseSettings):
+    """Credentials for the external services (Graph, Claude, FileMaker)."""
+
+    model_config = _ENV_CONFIG
+
     # Microsoft Graph API (for email integration)
     graph_client_id: Optional[str] = None
     graph_client_secret: Optional[str] = None
@@ -41,33 +67,32 @@ class Settings(BaseSettings):
     filemaker_username: Optional[str] = None
     filemaker_password: Optional[str] = None
 
-    # Application settings
-    app_name: str = "Referral CRM"
-    debug: bool = False
-    attachments_dir: Path = Path("./attachments")
 
-    # Email polling
-    email_poll_interval_seconds: int = 60
-    email_inbox_folder: str = "Inbox"
+class AwsSettings(BaseSettings):
+    """S3 storage settings."""
+
+    model_config = _ENV_CONFIG
 
-    # S3 Storage
     s3_bucket: Optional[str] = None
     aws_access_key_id: Optional[str] = None
     aws_secret_access_key: Optional[str] = None
     aws_region: str = "us-east-1"
     aws_endpoint_url: Optional[str] = None  # For S3-compatible services (MinIO, etc.)
 
-    def get_db_path(self) -> Path:
-        """Extract the database file path from the URL."""
-        if self.database_url.startswith("sqlite:///"):
-            return Path(self.database_url.replace("sqlite:///", ""))
-        return Path("referral_crm.db")
+
+@lru_cache(maxsize=1)
+def get_settings() -> CoreSettings:
+    """Get the core settings instance (loaded from the environment on first use)."""
+    return CoreSettings()
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_integrations_settings() -> IntegrationsSettings:
+    """Get the external-service settings (loaded on first use)."""
+    return IntegrationsSettings()
 
 
-def get_settings() -> Settings:
-    """Get the global settings instance."""
-    return settings
+@lru_cache(maxsize=1)
+def get_aws_settings() -> AwsSettings:
+    """Get the S3 storage settings (loaded on first use)."""
+    return AwsSettings()
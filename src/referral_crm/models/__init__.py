@@ -2,61 +2,139 @@
 Database models for Referral CRM.
 
 This module exports all models, enums, and database utilities.
+
+Exports are loaded lazily (PEP 562), so importing the package is cheap.
+Enums load on their own; anything else imports the engine and every model
+module together, since the mappers reference each other by name and
+init_db() needs all tables registered on Base.metadata.
 """
 
-from referral_crm.models.base import Base, engine, get_session, init_db, reset_db, session_scope
+import importlib
+from typing import TYPE_CHECKING
 
-# Enums
-from referral_crm.models.enums import (
-    DocumentType,
-    EmailStatus,
-    LineItemStatus,
-    Priority,
-    QueueItemStatus,
-    QueueType,
-    ReferralStatus,
-    ServiceModality,
-)
+if TYPE_CHECKING:
+    from referral_crm.models.base import (
+        Base,
+        bulk_upsert,
+        copy_insert,
+        engine,
+        get_session,
+        init_db,
+        insert_if_absent,
+        reset_db,
+        session_scope,
+    )
+    from referral_crm.models.dimensions import (
+        DimBodyRegion,
+        DimICD10,
+        DimProcedureCode,
+        DimServiceType,
+    )
+    from referral_crm.models.email import Attachment, Email, ExtractionResult
+    from referral_crm.models.enums import (
+        DocumentType,
+        EmailStatus,
+        LineItemStatus,
+        Priority,
+        QueueItemStatus,
+        QueueType,
+        ReferralStatus,
+        ServiceModality,
+    )
+    from referral_crm.models.queue import Queue, QueueItem
+    from referral_crm.models.referral import (
+        AuditLog,
+        Carrier,
+        Provider,
+        ProviderService,
+        RateSchedule,
+        Referral,
+        ReferralLineItem,
+        ReplyTemplate,
+    )
 
-# Email models
-from referral_crm.models.email import (
-    Attachment,
-    Email,
-    ExtractionResult,
-)
+_ENUMS_MODULE = "referral_crm.models.enums"
 
-# Queue models
-from referral_crm.models.queue import (
-    Queue,
-    QueueItem,
+# Imported together on first access to anything that is not an enum
+_MODEL_MODULES = (
+    "referral_crm.models.base",
+    "referral_crm.models.email",
+    "referral_crm.models.queue",
+    "referral_crm.models.dimensions",
+    "referral_crm.models.referral",
 )
 
-# Dimension models
-from referral_crm.models.dimensions import (
-    DimBodyRegion,
-    DimICD10,
-    DimProcedureCode,
-    DimServiceType,
-)
+_LAZY = {
+    # Base and utilities
+    "Base": "referral_crm.models.base",
+    "bulk_upsert": "referral_crm.models.base",
+    "copy_insert": "referral_crm.models.base",
+    "engine": "referral_crm.models.base",
+    "get_session": "referral_crm.models.base",
+    "init_db": "referral_crm.models.base",
+    "insert_if_absent": "referral_crm.models.base",
+    "reset_db": "referral_crm.models.base",
+    "session_scope": "referral_crm.models.base",
+    # Enums
+    "DocumentType": _ENUMS_MODULE,
+    "EmailStatus": _ENUMS_MODULE,
+    "LineItemStatus": _ENUMS_MODULE,
+    "Priority": _ENUMS_MODULE,
+    "QueueItemStatus": _ENUMS_MODULE,
+    "QueueType": _ENUMS_MODULE,
+    "ReferralStatus": _ENUMS_MODULE,
+    "ServiceModality": _ENUMS_MODULE,
+    # Email models
+    "Email": "referral_crm.models.email",
+    "Attachment": "referral_crm.models.email",
+    "ExtractionResult": "referral_crm.models.email",
+    # Queue models
+    "Queue": "referral_crm.models.queue",
+    "QueueItem": "referral_crm.models.queue",
+    # Dimension models
+    "DimBodyRegion": "referral_crm.models.dimensions",
+    "DimICD10": "referral_crm.models.dimensions",
+    "DimProcedureCode": "referral_crm.models.dimensions",
+    "DimServiceType": "referral_crm.models.dimensions",
+    # Referral models
+    "Referral": "referral_crm.models.referral",
+    "ReferralLineItem": "referral_crm.models.referral",
+    "Carrier": "referral_crm.models.referral",
+    "Provider": "referral_crm.models.referral",
+    "ProviderService": "referral_crm.models.referral",
+    "RateSchedule": "referral_crm.models.referral",
+    "ReplyTemplate": "referral_crm.models.referral",
+    "AuditLog": "referral_crm.models.referral",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    if module_name != _ENUMS_MODULE:
+        for model_module in _MODEL_MODULES:
+            importlib.import_module(model_module)
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY))
 
-# Referral models
-from referral_crm.models.referral import (
-    AuditLog,
-    Carrier,
-    Provider,
-    ProviderService,
-    RateSchedule,
-    Referral,
-    ReferralLineItem,
-    ReplyTemplate,
-)
 
 __all__ = [
     # Base and utilities
     "Base",
+    "bulk_upsert",
+    "copy_insert",
     "engine",
     "get_session",
     "init_db",
+    "insert_if_absent",
     "reset_db",
     "session_scope",
     # Enums
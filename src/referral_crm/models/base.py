@@ -2,37 +2,107 @@
 Database base configuration and session management.
 """
 
+import csv
+import io
+import sqlite3
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Optional, Sequence, TypeVar
 
-from sqlalchemy import create_engine, event
+import orjson
+from sqlalchemy import Column, create_engine, event, insert, inspect, make_url
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from referral_crm.config import get_settings
+from referral_crm.models.upgrade import upgrade_schema
 
 
 class Base(DeclarativeBase):
-    """Base class for all database models."""
+    """
+    Base class for all database models.
+
+    Server-generated defaults (SQL timestamps) after INSERT: models whose new
+    rows are read back right away set __mapper_args__ eager_defaults=True to
+    get them in the INSERT's RETURNING; high-volume, write-only models set it
+    to False so nothing is returned; the rest keep SQLAlchemy's "auto".
+    """
 
     pass
 
 
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns with orjson (much faster than the stdlib json module)."""
+    return orjson.dumps(value).decode("utf-8")
+
+
 # Create engine with settings
 settings = get_settings()
+_is_sqlite = "sqlite" in settings.database_url
+_sqlite_in_memory = _is_sqlite and (
+    ":memory:" in settings.database_url
+    or settings.database_url in ("sqlite://", "sqlite:///")
+)
+
+# Connection pool sized for the API plus ingestion workers. In-memory SQLite
+# keeps SQLAlchemy's default single-connection pool (each new connection
+# would be a separate, empty database).
+_pool_kwargs = {} if _sqlite_in_memory else {"pool_size": 5, "max_overflow": 10}
+
+# Batched writes: multi-row INSERTs go out in pages of up to 1000 rows
+# (insertmanyvalues); on psycopg2, executemany UPDATEs are batched as well
+_dialect_kwargs = {}
+if make_url(settings.database_url).get_driver_name() == "psycopg2":
+    _dialect_kwargs["executemany_mode"] = "values_plus_batch"
+
 engine = create_engine(
     settings.database_url,
     echo=settings.database_echo,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    query_cache_size=1200,
+    insertmanyvalues_page_size=1000,
+    **_pool_kwargs,
+    **_dialect_kwargs,
 )
 
-# Enable foreign keys for SQLite
-if "sqlite" in settings.database_url:
+# Per-connection SQLite tuning: foreign keys, WAL so readers don't block on
+# the writer, and larger page cache / mmap window for reads
+SQLITE_PRAGMAS = """
+PRAGMA foreign_keys=ON;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+"""
+
+if _is_sqlite:
+
+    def _sqlite_optimize(dbapi_connection, pragma: str) -> None:
+        # optimize may write sqlite_stat1; skip it this time if another
+        # connection (e.g. an ingestion worker) holds the write lock
+        try:
+            dbapi_connection.execute(pragma)
+        except sqlite3.OperationalError:
+            pass
 
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+        pragmas = SQLITE_PRAGMAS
+        if not _sqlite_in_memory:
+            pragmas = "PRAGMA journal_mode=WAL;" + pragmas
+        dbapi_connection.executescript(pragmas)
+        # SQLite's recommended call at open: check every table's stats once
+        _sqlite_optimize(dbapi_connection, "PRAGMA optimize=0x10002")
+
+    @event.listens_for(engine, "checkin")
+    def run_sqlite_optimize(dbapi_connection, connection_record):
+        # Cheap when nothing changed; re-analyzes only tables whose stats have
+        # drifted, so plans keep up with table growth without a full ANALYZE
+        if dbapi_connection is not None:
+            _sqlite_optimize(dbapi_connection, "PRAGMA optimize")
 
 
 # Session factory
@@ -62,9 +132,162 @@ def session_scope() -> Generator[Session, None, None]:
         session.close()
 
 
+def _upsert_insert(session: Session):
+    """The dialect's insert() construct, which supports ON CONFLICT clauses."""
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def bulk_upsert(
+    session: Session,
+    model: type[Base],
+    rows: Sequence[dict],
+    index_elements: Sequence[str],
+) -> int:
+    """
+    Insert rows, updating existing ones that collide on a unique key.
+
+    Runs as a single executemany INSERT ... ON CONFLICT DO UPDATE instead of a
+    lookup and ORM object per row. Every row must have the same keys.
+
+    Args:
+        session: Database session (not committed here)
+        model: Mapped class to write to
+        rows: Column values per row
+        index_elements: Columns of the unique constraint to match on
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    stmt = _upsert_insert(session)(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={
+            key: stmt.excluded[key] for key in rows[0] if key not in index_elements
+        },
+    )
+    session.execute(stmt, list(rows))
+    return len(rows)
+
+
+def insert_if_absent(
+    session: Session,
+    model: type[ModelT],
+    values: dict,
+    index_elements: Sequence[str],
+) -> Optional[ModelT]:
+    """
+    Insert a row unless one already exists with the same unique key.
+
+    The duplicate check and the insert are one INSERT ... ON CONFLICT DO
+    NOTHING RETURNING statement, so there is no SELECT beforehand and no
+    race between concurrent writers of the same key.
+
+    Args:
+        session: Database session (not committed here)
+        model: Mapped class to write to
+        values: Column values for the new row
+        index_elements: Columns of the unique constraint to match on
+
+    Returns:
+        The new object (attached to the session), or None if the key exists
+    """
+    stmt = (
+        _upsert_insert(session)(model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=list(index_elements))
+        .returning(model)
+    )
+    return session.scalars(stmt).first()
+
+
+def copy_insert(session: Session, model: type[Base], rows: Sequence[dict]) -> int:
+    """
+    Append rows with PostgreSQL COPY instead of INSERT statements.
+
+    COPY skips per-statement parsing and planning, which makes it the fastest
+    path for append-only bulk loads. Values go through each column's bind
+    processing, so custom types (enum codes, epoch timestamps, JSON) are
+    stored as an INSERT would store them. COPY never applies Python-side
+    defaults, so columns left out of the rows are given their scalar
+    default= value here; the rest get their server defaults. Other databases
+    and drivers fall back to one executemany INSERT. Every row must have the
+    same keys (attribute names).
+
+    Args:
+        session: Database session (not committed here)
+        model: Mapped class to write to
+        rows: Column values per row
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    connection = session.connection()
+    dialect = connection.dialect
+    if dialect.name != "postgresql" or dialect.driver not in ("psycopg2", "psycopg"):
+        session.execute(insert(model), list(rows))
+        return len(rows)
+
+    mapper = inspect(model)
+    defaults = {
+        key: column.default.arg
+        for key, column in mapper.columns.items()
+        if key not in rows[0]
+        and isinstance(column, Column)
+        and column.default is not None
+        and column.default.is_scalar
+    }
+    if defaults:
+        rows = [{**defaults, **row} for row in rows]
+
+    keys = list(rows[0])
+    columns = [mapper.columns[key] for key in keys]
+    processors = [column.type.bind_processor(dialect) for column in columns]
+    table = model.__table__.name
+    column_list = ", ".join(dialect.identifier_preparer.quote(column.name) for column in columns)
+
+    def values(row: dict) -> list:
+        return [
+            process(row[key]) if process else row[key]
+            for key, process in zip(keys, processors)
+        ]
+
+    cursor = connection.connection.cursor()
+    try:
+        if dialect.driver == "psycopg":
+            with cursor.copy(f"COPY {table} ({column_list}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(values(row))
+        else:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for row in rows:
+                writer.writerow(
+                    ["\\N" if value is None else value for value in values(row)]
+                )
+            buf.seek(0)
+            cursor.copy_expert(
+                f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buf,
+            )
+    finally:
+        cursor.close()
+    return len(rows)
+
+
 def init_db() -> None:
-    """Initialize the database, creating all tables."""
+    """Initialize the database: create missing tables and upgrade existing ones."""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine, Base.metadata)
 
 
 def reset_db() -> None:
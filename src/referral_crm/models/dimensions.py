@@ -12,20 +12,23 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
+    Connection,
     DateTime,
-    Enum,
     Float,
     ForeignKey,
     Integer,
-    String,
-    Text,
+    Table,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from referral_crm.models.base import Base
-from referral_crm.models.enums import ServiceModality
+from referral_crm.models.enums import SERVICE_MODALITY_TYPE, ServiceModality
+from referral_crm.models.types import STR_20, STR_100, STR_500, utc_now
+from referral_crm.models.upgrade import register_sqlite_step
 
 
 class DimICD10(Base):
@@ -41,29 +44,29 @@ class DimICD10(Base):
 
     __tablename__ = "dim_icd10"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # =========================================================================
     # CODE & DESCRIPTION
     # =========================================================================
     code: Mapped[str] = mapped_column(
-        String(20), unique=True, nullable=False, index=True
+        STR_20, unique=True, nullable=False, index=True
     )
-    description: Mapped[str] = mapped_column(String(500), nullable=False)
+    description: Mapped[str] = mapped_column(STR_500, nullable=False)
 
     # =========================================================================
     # CLASSIFICATION
     # =========================================================================
-    category: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    category: Mapped[Optional[str]] = mapped_column(STR_100, index=True)
     # e.g., "Musculoskeletal", "Nervous System", "Injury", "Pain"
 
-    subcategory: Mapped[Optional[str]] = mapped_column(String(100))
+    subcategory: Mapped[Optional[str]] = mapped_column(STR_100)
     # e.g., "Dorsopathies", "Soft tissue disorders"
 
-    body_region: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    body_region: Mapped[Optional[str]] = mapped_column(STR_100, index=True)
     # e.g., "Back", "Shoulder", "Knee", "Neck", "Hip"
 
-    body_side: Mapped[Optional[str]] = mapped_column(String(20))
+    body_side: Mapped[Optional[str]] = mapped_column(STR_20)
     # e.g., "left", "right", "bilateral", "unspecified"
 
     # =========================================================================
@@ -79,10 +82,12 @@ class DimICD10(Base):
     # STATUS
     # =========================================================================
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
 
     def __repr__(self) -> str:
-        return f"<DimICD10(code='{self.code}', desc='{self.description[:50]}...')>"
+        return f"<DimICD10(code='{self.code}', desc='{(self.description or '')[:50]}...')>"
 
 
 class DimProcedureCode(Base):
@@ -97,26 +102,26 @@ class DimProcedureCode(Base):
 
     __tablename__ = "dim_procedure_codes"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # =========================================================================
     # CODE & DESCRIPTION
     # =========================================================================
     code: Mapped[str] = mapped_column(
-        String(20), unique=True, nullable=False, index=True
+        STR_20, unique=True, nullable=False, index=True
     )
-    description: Mapped[str] = mapped_column(String(500), nullable=False)
+    description: Mapped[str] = mapped_column(STR_500, nullable=False)
 
     # =========================================================================
     # CLASSIFICATION
     # =========================================================================
-    service_type: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    service_type: Mapped[Optional[str]] = mapped_column(STR_100, index=True)
     # e.g., "PT Evaluation", "MRI", "CT Scan", "X-Ray", "Injection"
 
-    modality: Mapped[Optional[str]] = mapped_column(String(100))
+    modality: Mapped[Optional[str]] = mapped_column(STR_100)
     # e.g., "Physical Therapy", "Imaging", "Diagnostic", "Pain Management"
 
-    body_region: Mapped[Optional[str]] = mapped_column(String(100))
+    body_region: Mapped[Optional[str]] = mapped_column(STR_100)
     # e.g., "Spine", "Upper Extremity", "Lower Extremity", "Whole Body"
 
     # =========================================================================
@@ -135,7 +140,9 @@ class DimProcedureCode(Base):
     # STATUS
     # =========================================================================
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
 
     def __repr__(self) -> str:
         return f"<DimProcedureCode(code='{self.code}', type='{self.service_type}')>"
@@ -151,18 +158,18 @@ class DimServiceType(Base):
 
     __tablename__ = "dim_service_types"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # =========================================================================
     # IDENTITY
     # =========================================================================
-    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    display_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(STR_100, unique=True, nullable=False)
+    display_name: Mapped[str] = mapped_column(STR_100, nullable=False)
 
     # =========================================================================
     # CLASSIFICATION
     # =========================================================================
-    modality: Mapped[Optional[ServiceModality]] = mapped_column(Enum(ServiceModality))
+    modality: Mapped[Optional[ServiceModality]] = mapped_column(SERVICE_MODALITY_TYPE)
 
     # =========================================================================
     # MATCHING
@@ -173,7 +180,7 @@ class DimServiceType(Base):
     # =========================================================================
     # DEFAULTS
     # =========================================================================
-    default_cpt_code: Mapped[Optional[str]] = mapped_column(String(20))
+    default_cpt_code: Mapped[Optional[str]] = mapped_column(STR_20)
 
     # =========================================================================
     # STATUS & ORDERING
@@ -195,13 +202,13 @@ class DimBodyRegion(Base):
 
     __tablename__ = "dim_body_regions"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # =========================================================================
     # IDENTITY
     # =========================================================================
-    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    display_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(STR_100, unique=True, nullable=False)
+    display_name: Mapped[str] = mapped_column(STR_100, nullable=False)
 
     # =========================================================================
     # HIERARCHY
@@ -211,7 +218,7 @@ class DimBodyRegion(Base):
     # =========================================================================
     # CLASSIFICATION
     # =========================================================================
-    anatomical_group: Mapped[Optional[str]] = mapped_column(String(100))
+    anatomical_group: Mapped[Optional[str]] = mapped_column(STR_100)
     # e.g., "Spine", "Upper Extremity", "Lower Extremity", "Head/Neck", "Trunk"
 
     # =========================================================================
@@ -235,3 +242,80 @@ class DimBodyRegion(Base):
 
     def __repr__(self) -> str:
         return f"<DimBodyRegion(name='{self.name}', group='{self.anatomical_group}')>"
+
+
+# =============================================================================
+# DESCRIPTION SEARCH INDEXES (SQLite)
+# =============================================================================
+# FTS5's trigram tokenizer first shipped in SQLite 3.34
+_TRIGRAM_MIN_SQLITE_VERSION = (3, 34)
+
+_SEARCHABLE_TABLES = (DimICD10.__table__, DimProcedureCode.__table__)
+
+
+def _trigram_supported(ddl, target, bind, **kw) -> bool:
+    """execute_if() check: the SQLite library has the trigram tokenizer."""
+    return bind.dialect.server_version_info >= _TRIGRAM_MIN_SQLITE_VERSION
+
+
+def _description_search_statements(table: Table) -> list[str]:
+    """DDL for a table's FTS5 index and sync triggers, ending with a full rebuild."""
+    name = table.name
+    fts = f"{name}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"description, content='{name}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {name} BEGIN "
+        f"INSERT INTO {fts}(rowid, description) VALUES (new.id, new.description); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, description) "
+        f"VALUES ('delete', old.id, old.description); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF description ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, description) "
+        f"VALUES ('delete', old.id, old.description); "
+        f"INSERT INTO {fts}(rowid, description) VALUES (new.id, new.description); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _add_description_search_index(table: Table) -> None:
+    """
+    Attach an FTS5 trigram index over a dimension table's description.
+
+    The trigram tokenizer lets SQLite answer `description LIKE '%term%'`
+    from the index instead of scanning every row. Triggers keep it in sync
+    with the base table; ReferenceDataService uses it when present and falls
+    back to a LIKE scan otherwise (e.g. SQLite older than 3.34).
+    """
+    for statement in _description_search_statements(table):
+        event.listen(
+            table,
+            "after_create",
+            DDL(statement).execute_if(dialect="sqlite", callable_=_trigram_supported),
+        )
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {table.name}_fts").execute_if(dialect="sqlite"),
+    )
+
+
+_add_description_search_index(DimICD10.__table__)
+_add_description_search_index(DimProcedureCode.__table__)
+
+
+@register_sqlite_step
+def _sync_description_search_indexes(connection: Connection) -> None:
+    """
+    Create the search indexes on tables that predate them, or whose triggers
+    a table rebuild dropped, and rebuild them from the table's rows.
+    """
+    if connection.dialect.server_version_info < _TRIGRAM_MIN_SQLITE_VERSION:
+        return
+    existing = set(connection.exec_driver_sql("SELECT name FROM sqlite_master").scalars())
+    for table in _SEARCHABLE_TABLES:
+        fts = f"{table.name}_fts"
+        objects = {fts, f"{fts}_ai", f"{fts}_ad", f"{fts}_au"}
+        if table.name in existing and not objects <= existing:
+            for statement in _description_search_statements(table):
+                connection.exec_driver_sql(statement)
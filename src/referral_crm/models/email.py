@@ -11,18 +11,33 @@ from typing import TYPE_CHECKING, Optional
 from sqlalchemy import (
     JSON,
     Boolean,
-    DateTime,
-    Enum,
     Float,
     ForeignKey,
+    Identity,
+    Index,
     Integer,
-    String,
-    Text,
+    text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from referral_crm.models.base import Base
-from referral_crm.models.enums import DocumentType, EmailStatus
+from referral_crm.models.enums import (
+    DOCUMENT_TYPE_TYPE,
+    EMAIL_STATUS_TYPE,
+    DocumentType,
+    EmailStatus,
+)
+from referral_crm.models.types import (
+    BIG_ID,
+    JSON_DOCUMENT,
+    STR_20,
+    STR_100,
+    STR_255,
+    STR_500,
+    TEXT,
+    EpochMicros,
+    utc_epoch_micros,
+)
 
 if TYPE_CHECKING:
     from referral_crm.models.referral import Referral
@@ -37,86 +52,110 @@ class Email(Base):
     """
 
     __tablename__ = "emails"
+    __table_args__ = (
+        EMAIL_STATUS_TYPE.check_constraint("status", "ck_emails_status"),
+        # Poller: WHERE status = ? ORDER BY received_at DESC LIMIT n
+        # (read backwards, so no sort step; also serves status-only filters)
+        Index("ix_emails_status_received", "status", "received_at"),
+        # Just the emails still waiting to be processed (status code 'R')
+        Index(
+            "ix_emails_unprocessed",
+            "received_at",
+            sqlite_where=text("status = 'R'"),
+            postgresql_where=text("status = 'R'"),
+        ),
+    )
+    # Fetch SQL-generated timestamps with RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # =========================================================================
     # GRAPH API IDENTIFIERS
     # =========================================================================
     graph_id: Mapped[str] = mapped_column(
-        String(500), unique=True, nullable=False, index=True
+        STR_500, unique=True, nullable=False, index=True
     )
-    internet_message_id: Mapped[Optional[str]] = mapped_column(String(500))
-    conversation_id: Mapped[Optional[str]] = mapped_column(String(500))
-    web_link: Mapped[Optional[str]] = mapped_column(Text)
+    internet_message_id: Mapped[Optional[str]] = mapped_column(STR_500)
+    conversation_id: Mapped[Optional[str]] = mapped_column(STR_500)
+    web_link: Mapped[Optional[str]] = mapped_column(TEXT)
 
     # =========================================================================
     # EMAIL METADATA
     # =========================================================================
-    subject: Mapped[Optional[str]] = mapped_column(String(500))
-    from_email: Mapped[Optional[str]] = mapped_column(String(255), index=True)
-    from_name: Mapped[Optional[str]] = mapped_column(String(255))
+    subject: Mapped[Optional[str]] = mapped_column(STR_500)
+    from_email: Mapped[Optional[str]] = mapped_column(STR_255, index=True)
+    from_name: Mapped[Optional[str]] = mapped_column(STR_255)
     to_emails: Mapped[Optional[dict]] = mapped_column(JSON)  # JSON array
     cc_emails: Mapped[Optional[dict]] = mapped_column(JSON)  # JSON array
 
     # =========================================================================
     # CONTENT
     # =========================================================================
-    body_preview: Mapped[Optional[str]] = mapped_column(Text)
-    body_html: Mapped[Optional[str]] = mapped_column(Text)
-    body_text: Mapped[Optional[str]] = mapped_column(Text)
+    body_preview: Mapped[Optional[str]] = mapped_column(TEXT)
+    # Bodies are deferred (loaded on first access) so list queries stay narrow
+    body_html: Mapped[Optional[str]] = mapped_column(TEXT, deferred=True, deferred_group="blob")
+    body_text: Mapped[Optional[str]] = mapped_column(TEXT, deferred=True, deferred_group="blob")
 
     # =========================================================================
     # FLAGS
     # =========================================================================
     has_attachments: Mapped[bool] = mapped_column(Boolean, default=False)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
-    importance: Mapped[Optional[str]] = mapped_column(String(20))  # normal, high, low
+    importance: Mapped[Optional[str]] = mapped_column(STR_20)  # normal, high, low
 
     # =========================================================================
     # PROCESSING STATUS
     # =========================================================================
-    status: Mapped[EmailStatus] = mapped_column(
-        Enum(EmailStatus), default=EmailStatus.RECEIVED, index=True
-    )
+    status: Mapped[EmailStatus] = mapped_column(EMAIL_STATUS_TYPE, default=EmailStatus.RECEIVED)
     extraction_attempts: Mapped[int] = mapped_column(Integer, default=0)
-    last_extraction_error: Mapped[Optional[str]] = mapped_column(Text)
+    last_extraction_error: Mapped[Optional[str]] = mapped_column(TEXT)
 
     # =========================================================================
     # S3 STORAGE
     # =========================================================================
-    s3_raw_key: Mapped[Optional[str]] = mapped_column(String(500))  # Original email
-    s3_html_key: Mapped[Optional[str]] = mapped_column(String(500))  # HTML content
+    s3_raw_key: Mapped[Optional[str]] = mapped_column(STR_500)  # Original email
+    s3_html_key: Mapped[Optional[str]] = mapped_column(STR_500)  # HTML content
     s3_extraction_key: Mapped[Optional[str]] = mapped_column(
-        String(500)
+        STR_500
     )  # Extraction JSON
 
     # =========================================================================
     # TIMESTAMPS
     # =========================================================================
-    received_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
-    ingested_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    received_at: Mapped[datetime] = mapped_column(EpochMicros, nullable=False, index=True)
+    ingested_at: Mapped[datetime] = mapped_column(
+        EpochMicros, default=utc_epoch_micros(), server_default=utc_epoch_micros()
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros)
+    created_at: Mapped[datetime] = mapped_column(
+        EpochMicros, default=utc_epoch_micros(), server_default=utc_epoch_micros()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        EpochMicros,
+        default=utc_epoch_micros(),
+        server_default=utc_epoch_micros(),
+        onupdate=utc_epoch_micros(),
     )
 
     # =========================================================================
     # RELATIONSHIPS
     # =========================================================================
+    # Lazy loads that would emit SQL raise; load these with selectinload/joinedload
     attachments: Mapped[list["Attachment"]] = relationship(
-        "Attachment", back_populates="email", cascade="all, delete-orphan"
+        "Attachment", back_populates="email", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
     referral: Mapped[Optional["Referral"]] = relationship(
-        "Referral", back_populates="source_email", uselist=False
+        "Referral", back_populates="source_email", uselist=False, lazy="raise_on_sql"
     )
     extraction_result: Mapped[Optional["ExtractionResult"]] = relationship(
-        "ExtractionResult", back_populates="email", uselist=False
+        "ExtractionResult", back_populates="email", uselist=False, lazy="raise_on_sql"
     )
 
     def __repr__(self) -> str:
-        return f"<Email(id={self.id}, subject='{self.subject[:50] if self.subject else ''}...', status={self.status.value})>"
+        subject = (self.subject or "")[:50]
+        status = self.status.name if self.status else None
+        return f"<Email(id={self.id}, subject='{subject}...', status={status})>"
 
 
 class Attachment(Base):
@@ -129,13 +168,19 @@ class Attachment(Base):
     """
 
     __tablename__ = "attachments"
+    __table_args__ = (
+        DOCUMENT_TYPE_TYPE.check_constraint("document_type", "ck_attachments_document_type"),
+        # An email's attachments, optionally by document type (also serves
+        # email_id-only lookups)
+        Index("ix_attachments_email_document_type", "email_id", "document_type"),
+    )
+    # Fetch SQL-generated timestamps with RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIG_ID, Identity(), primary_key=True)
 
     # Source: either email or direct referral upload (one should be set)
-    email_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("emails.id"), nullable=True, index=True
-    )
+    email_id: Mapped[Optional[int]] = mapped_column(ForeignKey(Email.id), nullable=True)
     referral_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("referrals.id"), nullable=True, index=True
     )
@@ -143,31 +188,37 @@ class Attachment(Base):
     # =========================================================================
     # FILE METADATA
     # =========================================================================
-    filename: Mapped[str] = mapped_column(String(500), nullable=False)
-    content_type: Mapped[Optional[str]] = mapped_column(String(100))
+    filename: Mapped[str] = mapped_column(STR_500, nullable=False)
+    content_type: Mapped[Optional[str]] = mapped_column(STR_100)
     size_bytes: Mapped[Optional[int]] = mapped_column(Integer)
 
     # =========================================================================
     # GRAPH API REFERENCE
     # =========================================================================
-    graph_attachment_id: Mapped[Optional[str]] = mapped_column(String(500))
+    graph_attachment_id: Mapped[Optional[str]] = mapped_column(STR_500)
 
     # =========================================================================
     # STORAGE
     # =========================================================================
-    storage_path: Mapped[Optional[str]] = mapped_column(Text)  # Local path (fallback)
-    s3_key: Mapped[Optional[str]] = mapped_column(String(500))
-    s3_text_key: Mapped[Optional[str]] = mapped_column(String(500))  # Extracted text
+    storage_path: Mapped[Optional[str]] = mapped_column(TEXT)  # Local path (fallback)
+    s3_key: Mapped[Optional[str]] = mapped_column(STR_500)
+    s3_text_key: Mapped[Optional[str]] = mapped_column(STR_500)  # Extracted text
 
     # =========================================================================
     # DOCUMENT CLASSIFICATION
     # =========================================================================
-    document_type: Mapped[Optional[DocumentType]] = mapped_column(Enum(DocumentType))
+    document_type: Mapped[Optional[DocumentType]] = mapped_column(DOCUMENT_TYPE_TYPE)
 
     # =========================================================================
     # OCR/TEXT EXTRACTION
     # =========================================================================
-    extracted_text: Mapped[Optional[str]] = mapped_column(Text)
+    # Only kept in the row when the text was not written to S3 (s3_text_key);
+    # read it through the extracted_text property
+    stored_text: Mapped[Optional[str]] = mapped_column(
+        "extracted_text", TEXT, deferred=True, deferred_group="blob"
+    )
+    # Loaded with the row in place of the text itself
+    has_stored_text: Mapped[bool] = column_property(stored_text.column.is_not(None))
     extraction_confidence: Mapped[Optional[float]] = mapped_column(Float)
 
     # =========================================================================
@@ -181,15 +232,39 @@ class Attachment(Base):
     # =========================================================================
     # TIMESTAMPS
     # =========================================================================
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        EpochMicros, default=utc_epoch_micros(), server_default=utc_epoch_micros()
+    )
+
+    @property
+    def extracted_text(self) -> Optional[str]:
+        """Extracted document text, fetched (and cached) from S3 when not stored locally."""
+        if self.stored_text is not None or not self.s3_text_key:
+            return self.stored_text
+
+        from referral_crm.services.storage_service import get_cached_text
+
+        return get_cached_text(self.s3_text_key)
+
+    @extracted_text.setter
+    def extracted_text(self, value: Optional[str]) -> None:
+        self.stored_text = value
+
+    @property
+    def has_extracted_text(self) -> bool:
+        """Check for extracted text without fetching it."""
+        return bool(self.s3_text_key or self.has_stored_text)
 
     # =========================================================================
     # RELATIONSHIPS
     # =========================================================================
-    email: Mapped[Optional["Email"]] = relationship("Email", back_populates="attachments")
+    email: Mapped[Optional["Email"]] = relationship(
+        "Email", back_populates="attachments", lazy="raise_on_sql"
+    )
     referral: Mapped[Optional["Referral"]] = relationship(
         "Referral",
         foreign_keys=[referral_id],
+        lazy="raise_on_sql",
         back_populates="uploaded_attachments",
     )
 
@@ -206,28 +281,30 @@ class ExtractionResult(Base):
     """
 
     __tablename__ = "extraction_results"
+    # Fetch SQL-generated timestamps with RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email_id: Mapped[int] = mapped_column(
-        ForeignKey("emails.id"), unique=True, nullable=False
+        ForeignKey(Email.id), unique=True, nullable=False
     )
 
     # =========================================================================
     # RAW EXTRACTION DATA
     # =========================================================================
-    raw_extraction: Mapped[dict] = mapped_column(JSON, nullable=False)
+    raw_extraction: Mapped[dict] = mapped_column(JSON_DOCUMENT, nullable=False)
 
     # =========================================================================
     # EXTRACTION STEPS
     # =========================================================================
     extraction_step: Mapped[int] = mapped_column(Integer, default=1)  # 1 or 2
-    enrichment_data: Mapped[Optional[dict]] = mapped_column(JSON)  # Step 2 data
+    enrichment_data: Mapped[Optional[dict]] = mapped_column(JSON_DOCUMENT)  # Step 2 data
 
     # =========================================================================
     # CONFIDENCE METRICS
     # =========================================================================
     overall_confidence: Mapped[float] = mapped_column(Float, default=0.0)
-    field_confidences: Mapped[dict] = mapped_column(JSON, default=dict)
+    field_confidences: Mapped[dict] = mapped_column(JSON_DOCUMENT, default=dict)
 
     # =========================================================================
     # VALIDATION
@@ -238,15 +315,17 @@ class ExtractionResult(Base):
     # =========================================================================
     # MODEL INFO
     # =========================================================================
-    model_used: Mapped[Optional[str]] = mapped_column(String(100))
+    model_used: Mapped[Optional[str]] = mapped_column(STR_100)
     tokens_used: Mapped[Optional[int]] = mapped_column(Integer)
     extraction_duration_ms: Mapped[Optional[int]] = mapped_column(Integer)
 
     # =========================================================================
     # TIMESTAMPS
     # =========================================================================
-    extracted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    enriched_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    extracted_at: Mapped[datetime] = mapped_column(
+        EpochMicros, default=utc_epoch_micros(), server_default=utc_epoch_micros()
+    )
+    enriched_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros)
 
     # =========================================================================
     # RELATIONSHIPS
@@ -254,4 +333,5 @@ class ExtractionResult(Base):
     email: Mapped["Email"] = relationship("Email", back_populates="extraction_result")
 
     def __repr__(self) -> str:
-        return f"<ExtractionResult(id={self.id}, email_id={self.email_id}, confidence={self.overall_confidence:.1%})>"
+        confidence = self.overall_confidence or 0.0
+        return f"<ExtractionResult(id={self.id}, email_id={self.email_id}, confidence={confidence:.1%})>"
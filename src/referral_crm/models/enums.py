@@ -7,8 +7,64 @@ to ensure consistency in status values, priorities, and categorizations.
 
 import enum
 
+from referral_crm.models.types import CodedEnum, IntCodedEnum, NamedEnum
 
-class EmailStatus(enum.Enum):
+
+# =============================================================================
+# BASE CLASS
+# =============================================================================
+class _FastEnumMeta(enum.EnumMeta):
+    """
+    Enum metaclass whose value lookup (`Cls("value")`) is a single dict hit.
+
+    Also precomputes the member values, names and (value, name) choices once,
+    since enums cannot change after definition.
+    """
+
+    def __new__(metacls, cls, bases, classdict, **kwargs):
+        enum_class = super().__new__(metacls, cls, bases, classdict, **kwargs)
+        members = tuple(enum_class)
+        enum_class._values = tuple(member.value for member in members)
+        enum_class._names = tuple(member.name for member in members)
+        enum_class._choices = tuple(zip(enum_class._values, enum_class._names))
+        return enum_class
+
+    def __call__(cls, value, *args, **kwargs):
+        if not args and not kwargs:
+            try:
+                return cls._value2member_map_[value]
+            except (KeyError, TypeError):
+                pass  # Unknown/unhashable value: let EnumMeta raise the usual error
+        return super().__call__(value, *args, **kwargs)
+
+
+class FastStrEnum(str, enum.Enum, metaclass=_FastEnumMeta):
+    """
+    Base for the application enums.
+
+    Members are `str` instances equal to their value, so they compare to and
+    serialize as plain strings. `.value` and `.name` work as with any Enum.
+    """
+
+    @classmethod
+    def values(cls) -> tuple[str, ...]:
+        """All member values, in definition order."""
+        return cls._values
+
+    @classmethod
+    def choices(cls) -> tuple[tuple[str, str], ...]:
+        """(value, name) pairs for every member, in definition order."""
+        return cls._choices
+
+    def __str__(self) -> str:
+        return enum.Enum.__str__(self)
+
+    def __format__(self, format_spec: str) -> str:
+        # Same output as plain Enum on every Python version
+        return format(str(self), format_spec)
+
+
+class EmailStatus(FastStrEnum):
     """Status of an email record in the processing pipeline."""
 
     RECEIVED = "received"  # Just ingested from inbox
@@ -19,7 +75,7 @@ class EmailStatus(enum.Enum):
     PROCESSED = "processed"  # Referral created successfully
 
 
-class ReferralStatus(enum.Enum):
+class ReferralStatus(FastStrEnum):
     """Workflow status for referrals through the intake and care coordination process."""
 
     DRAFT = "draft"  # Created but incomplete
@@ -34,7 +90,7 @@ class ReferralStatus(enum.Enum):
     ON_HOLD = "on_hold"  # Temporarily paused
 
 
-class QueueType(enum.Enum):
+class QueueType(FastStrEnum):
     """Types of work queues in the system."""
 
     EXTRACTION = "extraction"  # Emails awaiting LLM extraction
@@ -42,7 +98,7 @@ class QueueType(enum.Enum):
     CARE_COORDINATION = "care_coordination"  # Validated referrals ready for scheduling
 
 
-class QueueItemStatus(enum.Enum):
+class QueueItemStatus(FastStrEnum):
     """Status of an item within a work queue."""
 
     PENDING = "pending"  # Waiting to be processed
@@ -52,7 +108,7 @@ class QueueItemStatus(enum.Enum):
     FAILED = "failed"  # Processing failed
 
 
-class LineItemStatus(enum.Enum):
+class LineItemStatus(FastStrEnum):
     """Status of a referral line item (individual service)."""
 
     PENDING = "pending"  # Awaiting authorization/scheduling
@@ -62,7 +118,7 @@ class LineItemStatus(enum.Enum):
     CANCELLED = "cancelled"  # Cancelled
 
 
-class Priority(enum.Enum):
+class Priority(FastStrEnum):
     """Priority levels for referrals and queue items."""
 
     LOW = "low"
@@ -71,7 +127,7 @@ class Priority(enum.Enum):
     URGENT = "urgent"
 
 
-class ServiceModality(enum.Enum):
+class ServiceModality(FastStrEnum):
     """Service modality types for categorizing medical services."""
 
     IMAGING = "imaging"  # MRI, CT, X-Ray, Ultrasound
@@ -87,7 +143,7 @@ class ServiceModality(enum.Enum):
     OTHER = "other"
 
 
-class DocumentType(enum.Enum):
+class DocumentType(FastStrEnum):
     """Types of documents attached to emails."""
 
     REFERRAL_FORM = "referral_form"
@@ -98,3 +154,90 @@ class DocumentType(enum.Enum):
     LAB_RESULT = "lab_result"
     LOGO = "logo"  # Email signature images
     OTHER = "other"
+
+
+# =============================================================================
+# COLUMN TYPES
+# =============================================================================
+# Shared enum column types, built once and reused by every column that
+# stores the corresponding enum. High-volume email/attachment enums are
+# stored as one-character codes, the referral/line item statuses, priority
+# and modality as SMALLINT codes, and the rest by member name. Never renumber
+# or reuse a code: stored rows depend on it.
+EMAIL_STATUS_TYPE = CodedEnum(
+    EmailStatus,
+    {
+        EmailStatus.RECEIVED: "R",
+        EmailStatus.PENDING_EXTRACTION: "P",
+        EmailStatus.EXTRACTION_IN_PROGRESS: "I",
+        EmailStatus.EXTRACTION_COMPLETE: "C",
+        EmailStatus.EXTRACTION_FAILED: "F",
+        EmailStatus.PROCESSED: "D",
+    },
+)
+REFERRAL_STATUS_TYPE = IntCodedEnum(
+    ReferralStatus,
+    {
+        ReferralStatus.DRAFT: 0,
+        ReferralStatus.PENDING_VALIDATION: 1,
+        ReferralStatus.VALIDATED: 2,
+        ReferralStatus.PENDING_SCHEDULING: 3,
+        ReferralStatus.SCHEDULED: 4,
+        ReferralStatus.IN_PROGRESS: 5,
+        ReferralStatus.COMPLETED: 6,
+        ReferralStatus.SUBMITTED_TO_FILEMAKER: 7,
+        ReferralStatus.REJECTED: 8,
+        ReferralStatus.ON_HOLD: 9,
+    },
+)
+QUEUE_TYPE_TYPE = NamedEnum(QueueType)
+QUEUE_ITEM_STATUS_TYPE = NamedEnum(QueueItemStatus)
+LINE_ITEM_STATUS_TYPE = IntCodedEnum(
+    LineItemStatus,
+    {
+        LineItemStatus.PENDING: 0,
+        LineItemStatus.AUTHORIZED: 1,
+        LineItemStatus.SCHEDULED: 2,
+        LineItemStatus.COMPLETED: 3,
+        LineItemStatus.CANCELLED: 4,
+    },
+)
+# Codes rise with urgency, so ORDER BY priority sorts by urgency
+PRIORITY_TYPE = IntCodedEnum(
+    Priority,
+    {
+        Priority.LOW: 0,
+        Priority.MEDIUM: 1,
+        Priority.HIGH: 2,
+        Priority.URGENT: 3,
+    },
+)
+SERVICE_MODALITY_TYPE = IntCodedEnum(
+    ServiceModality,
+    {
+        ServiceModality.IMAGING: 0,
+        ServiceModality.PHYSICAL_THERAPY: 1,
+        ServiceModality.OCCUPATIONAL_THERAPY: 2,
+        ServiceModality.CHIROPRACTIC: 3,
+        ServiceModality.IME: 4,
+        ServiceModality.FCE: 5,
+        ServiceModality.SURGERY: 6,
+        ServiceModality.DIAGNOSTIC: 7,
+        ServiceModality.DME: 8,
+        ServiceModality.INJECTION: 9,
+        ServiceModality.OTHER: 10,
+    },
+)
+DOCUMENT_TYPE_TYPE = CodedEnum(
+    DocumentType,
+    {
+        DocumentType.REFERRAL_FORM: "R",
+        DocumentType.MEDICAL_RECORD: "M",
+        DocumentType.AUTHORIZATION: "A",
+        DocumentType.PRESCRIPTION: "P",
+        DocumentType.IMAGING_REPORT: "I",
+        DocumentType.LAB_RESULT: "L",
+        DocumentType.LOGO: "G",
+        DocumentType.OTHER: "O",
+    },
+)
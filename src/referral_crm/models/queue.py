@@ -10,17 +10,27 @@ from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import (
     Boolean,
+    CheckConstraint,
     DateTime,
-    Enum,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
     Text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from referral_crm.models.base import Base
-from referral_crm.models.enums import Priority, QueueItemStatus, QueueType
+from referral_crm.models.enums import (
+    PRIORITY_TYPE,
+    QUEUE_ITEM_STATUS_TYPE,
+    QUEUE_TYPE_TYPE,
+    Priority,
+    QueueItemStatus,
+    QueueType,
+)
+from referral_crm.models.types import EpochMicros, utc_epoch_micros, utc_now
 
 if TYPE_CHECKING:
     from referral_crm.models.email import Email
@@ -38,14 +48,16 @@ class Queue(Base):
     """
 
     __tablename__ = "queues"
+    # Fetch SQL-generated timestamps with RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # =========================================================================
     # QUEUE IDENTITY
     # =========================================================================
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    queue_type: Mapped[QueueType] = mapped_column(Enum(QueueType), nullable=False)
+    queue_type: Mapped[QueueType] = mapped_column(QUEUE_TYPE_TYPE, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
 
     # =========================================================================
@@ -68,17 +80,40 @@ class Queue(Base):
     # =========================================================================
     # TIMESTAMPS
     # =========================================================================
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
 
     # =========================================================================
     # RELATIONSHIPS
     # =========================================================================
-    items: Mapped[list["QueueItem"]] = relationship("QueueItem", back_populates="queue")
+    # Unbounded; query QueueItem through WorkflowService instead
+    items: Mapped[list["QueueItem"]] = relationship(
+        "QueueItem", back_populates="queue", lazy="raise_on_sql"
+    )
 
     def __repr__(self) -> str:
         return f"<Queue(id={self.id}, name='{self.name}', type={self.queue_type.value})>"
 
 
+_utcnow = datetime.utcnow
+
+# Longest error message kept on a queue item (longer ones are truncated)
+LAST_ERROR_MAX_LENGTH = 2048
+
+# QueueItem.item_kind values, indexed by kind
+ITEM_KIND_EMAIL = 0
+ITEM_KIND_REFERRAL = 1
+_KIND_NAMES = ("email", "referral")
+
+
+def _item_kind_default(context) -> int:
+    """Derive item_kind from which foreign key the INSERT sets."""
+    if context.get_current_parameters().get("email_id") is not None:
+        return ITEM_KIND_EMAIL
+    return ITEM_KIND_REFERRAL
+
+
 class QueueItem(Base):
     """
     Items in work queues.
@@ -97,18 +132,33 @@ class QueueItem(Base):
     """
 
     __tablename__ = "queue_items"
+    __table_args__ = (
+        # Dequeue / stats: WHERE queue_id = ? AND status = ? ORDER BY entered_queue_at
+        Index("ix_queue_items_dequeue", "queue_id", "status", "entered_queue_at"),
+        # Overdue scan: WHERE queue_id = ? AND status IN (...) AND due_at < ?
+        Index("ix_queue_items_overdue", "queue_id", "status", "due_at"),
+        # Exactly one of email_id / referral_id is set
+        CheckConstraint(
+            "(email_id IS NULL) <> (referral_id IS NULL)",
+            name="ck_queue_items_email_xor_referral",
+        ),
+        CheckConstraint(
+            f"(item_kind = {ITEM_KIND_EMAIL}) = (email_id IS NOT NULL)",
+            name="ck_queue_items_item_kind",
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # =========================================================================
     # QUEUE REFERENCE
     # =========================================================================
-    queue_id: Mapped[int] = mapped_column(
-        ForeignKey("queues.id"), nullable=False, index=True
-    )
+    # Indexed as the leading column of the composite indexes above
+    queue_id: Mapped[int] = mapped_column(ForeignKey(Queue.id), nullable=False)
 
     # =========================================================================
-    # ITEM BEING QUEUED (one of these should be set)
+    # ITEM BEING QUEUED (exactly one is set; enforced by a CHECK constraint)
     # =========================================================================
     email_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("emails.id"), index=True
@@ -116,16 +166,18 @@ class QueueItem(Base):
     referral_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("referrals.id"), index=True
     )
+    # Which of the two is set (ITEM_KIND_EMAIL / ITEM_KIND_REFERRAL), filled in on insert
+    item_kind: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, default=_item_kind_default
+    )
 
     # =========================================================================
     # STATUS & PRIORITY
     # =========================================================================
     status: Mapped[QueueItemStatus] = mapped_column(
-        Enum(QueueItemStatus), default=QueueItemStatus.PENDING, index=True
-    )
-    priority: Mapped[Priority] = mapped_column(
-        Enum(Priority), default=Priority.MEDIUM, index=True
+        QUEUE_ITEM_STATUS_TYPE, default=QueueItemStatus.PENDING
     )
+    priority: Mapped[Priority] = mapped_column(PRIORITY_TYPE, default=Priority.MEDIUM)
 
     # =========================================================================
     # ASSIGNMENT
@@ -138,18 +190,20 @@ class QueueItem(Base):
     # =========================================================================
     # SLA TRACKING
     # =========================================================================
+    # Stored as epoch microseconds: the overdue/dequeue filters compare plain
+    # integers and loading a row skips SQLite's datetime string parsing
     entered_queue_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, index=True
+        EpochMicros, default=utc_epoch_micros(), server_default=utc_epoch_micros()
     )
-    due_at: Mapped[Optional[datetime]] = mapped_column(DateTime, index=True)
-    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    due_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros)
+    started_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros)
 
     # =========================================================================
     # PROCESSING METADATA
     # =========================================================================
     attempt_count: Mapped[int] = mapped_column(Integer, default=0)
-    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    last_error: Mapped[Optional[str]] = mapped_column(String(LAST_ERROR_MAX_LENGTH))
 
     # =========================================================================
     # NOTES
@@ -159,9 +213,11 @@ class QueueItem(Base):
     # =========================================================================
     # TIMESTAMPS
     # =========================================================================
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utc_now(), server_default=utc_now(), onupdate=utc_now()
     )
 
     # =========================================================================
@@ -174,23 +230,31 @@ class QueueItem(Base):
     )
 
     def __repr__(self) -> str:
-        item_type = "email" if self.email_id else "referral"
-        item_id = self.email_id or self.referral_id
-        return f"<QueueItem(id={self.id}, {item_type}={item_id}, status={self.status.value})>"
+        if self.item_kind is None:  # Not flushed yet
+            return f"<QueueItem(id={self.id}, email={self.email_id}, referral={self.referral_id})>"
+        item_type = _KIND_NAMES[self.item_kind]
+        item_id = self.email_id if self.item_kind == ITEM_KIND_EMAIL else self.referral_id
+        status = self.status.value if self.status else None
+        return f"<QueueItem(id={self.id}, {item_type}={item_id}, status={status})>"
 
     @property
     def is_overdue(self) -> bool:
         """Check if this queue item is past its due date."""
-        if self.due_at is None:
-            return False
-        return datetime.utcnow() > self.due_at
+        return self.is_overdue_at(_utcnow())
 
     @property
     def wait_time_minutes(self) -> float:
         """Calculate how long this item has been waiting in the queue."""
-        end_time = self.started_at or datetime.utcnow()
-        delta = end_time - self.entered_queue_at
-        return delta.total_seconds() / 60
+        return self.wait_time_minutes_at(_utcnow())
+
+    def is_overdue_at(self, now: datetime) -> bool:
+        """is_overdue against a caller-supplied time (one clock read per listing)."""
+        return self.due_at is not None and now > self.due_at
+
+    def wait_time_minutes_at(self, now: datetime) -> float:
+        """wait_time_minutes against a caller-supplied time."""
+        end_time = self.started_at or now
+        return (end_time - self.entered_queue_at).total_seconds() / 60
 
     @property
     def processing_time_minutes(self) -> Optional[float]:
@@ -10,29 +10,46 @@ This module contains:
 """
 
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Sequence
 
 from sqlalchemy import (
-    JSON,
+    DDL,
     Boolean,
+    CheckConstraint,
+    Computed,
     Date,
     DateTime,
-    Enum,
     Float,
     ForeignKey,
+    Identity,
+    Index,
     Integer,
     String,
     Text,
+    event,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
-from referral_crm.models.base import Base
+from referral_crm.models.base import Base, copy_insert
 from referral_crm.models.enums import (
+    LINE_ITEM_STATUS_TYPE,
+    PRIORITY_TYPE,
+    REFERRAL_STATUS_TYPE,
+    SERVICE_MODALITY_TYPE,
     LineItemStatus,
     Priority,
     ReferralStatus,
     ServiceModality,
 )
+from referral_crm.models.types import (
+    ALIGN_1,
+    ALIGN_2,
+    ALIGN_4,
+    ALIGN_8,
+    BIG_ID,
+    JSON_DOCUMENT,
+    utc_now,
+)
 
 if TYPE_CHECKING:
     from referral_crm.models.dimensions import (
@@ -44,6 +61,28 @@ if TYPE_CHECKING:
     from referral_crm.models.email import Attachment, Email
     from referral_crm.models.queue import QueueItem
 
+# Longest free-text note accepted on referrals, line items and audit entries
+NOTES_MAX_LENGTH = 8192
+
+
+def _max_length_check(column: str, name: str) -> CheckConstraint:
+    """CHECK constraint capping a free-text column at NOTES_MAX_LENGTH characters."""
+    return CheckConstraint(f"length({column}) <= {NOTES_MAX_LENGTH}", name=name)
+
+
+# Fuzzy patient name search (PostgreSQL only); gin_trgm_ops comes from pg_trgm
+_PATIENT_NAME_TRGM_INDEX = Index(
+    "ix_referrals_patient_full_name_trgm",
+    "patient_full_name",
+    postgresql_using="gin",
+    postgresql_ops={"patient_full_name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+event.listen(
+    _PATIENT_NAME_TRGM_INDEX,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 
 # =============================================================================
 # CARRIER MODEL
@@ -55,16 +94,18 @@ class Carrier(Base):
 
     __tablename__ = "carriers"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     code: Mapped[Optional[str]] = mapped_column(String(50))
     contact_email: Mapped[Optional[str]] = mapped_column(String(255))
     contact_phone: Mapped[Optional[str]] = mapped_column(String(50))
     notes: Mapped[Optional[str]] = mapped_column(Text)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utc_now(), server_default=utc_now(), onupdate=utc_now()
     )
 
     # Relationships
@@ -86,7 +127,7 @@ class Provider(Base):
 
     __tablename__ = "providers"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     npi: Mapped[Optional[str]] = mapped_column(String(20), unique=True)
     tax_id: Mapped[Optional[str]] = mapped_column(String(20))
@@ -102,9 +143,11 @@ class Provider(Base):
     avg_wait_days: Mapped[Optional[int]] = mapped_column(Integer)
     notes: Mapped[Optional[str]] = mapped_column(Text)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utc_now(), server_default=utc_now(), onupdate=utc_now()
     )
 
     # Relationships
@@ -121,9 +164,9 @@ class ProviderService(Base):
 
     __tablename__ = "provider_services"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     provider_id: Mapped[int] = mapped_column(
-        ForeignKey("providers.id"), nullable=False
+        ForeignKey(Provider.id), nullable=False
     )
     service_type: Mapped[str] = mapped_column(String(100), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -142,8 +185,8 @@ class RateSchedule(Base):
 
     __tablename__ = "rate_schedules"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    carrier_id: Mapped[int] = mapped_column(ForeignKey("carriers.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    carrier_id: Mapped[int] = mapped_column(ForeignKey(Carrier.id), nullable=False)
     service_type: Mapped[str] = mapped_column(String(100), nullable=False)
     body_region: Mapped[Optional[str]] = mapped_column(String(100))
     state: Mapped[Optional[str]] = mapped_column(String(2))
@@ -152,7 +195,9 @@ class RateSchedule(Base):
     effective_date: Mapped[Optional[datetime]] = mapped_column(Date)
     expiration_date: Mapped[Optional[datetime]] = mapped_column(Date)
     notes: Mapped[Optional[str]] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
 
     # Relationships
     carrier: Mapped["Carrier"] = relationship("Carrier", back_populates="rate_schedules")
@@ -170,17 +215,33 @@ class Referral(Base):
     This table now focuses on the referral itself, not email metadata.
     Email data is accessed via the source_email relationship.
     Line items capture individual services requested.
+    Notes are capped at NOTES_MAX_LENGTH characters.
     """
 
     __tablename__ = "referrals"
+    __table_args__ = (
+        # Worklist page: WHERE status = ? ORDER BY received_at DESC LIMIT n
+        # (read backwards, so no sort step)
+        Index("ix_referrals_status_received", "status", "received_at"),
+        # Key/containment lookups into the raw extraction (PostgreSQL only)
+        Index("ix_referrals_extraction_data", "extraction_data", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        _PATIENT_NAME_TRGM_INDEX,
+        _max_length_check("notes", "ck_referrals_notes_length"),
+    )
+    # Fetch SQL-generated timestamps with RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # Fixed-width columns carry an ALIGN_* sort_order so the table lays them
+    # out first, widest alignment first; columns stay grouped by topic here
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, sort_order=ALIGN_4)
 
     # =========================================================================
     # SOURCE EMAIL (one-to-one)
     # =========================================================================
     email_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("emails.id"), unique=True, index=True
+        ForeignKey("emails.id"), unique=True, index=True, sort_order=ALIGN_4
     )
 
     # =========================================================================
@@ -193,7 +254,7 @@ class Referral(Base):
     # =========================================================================
     # ASSIGNING COMPANY (Insurance Carrier)
     # =========================================================================
-    carrier_id: Mapped[Optional[int]] = mapped_column(ForeignKey("carriers.id"))
+    carrier_id: Mapped[Optional[int]] = mapped_column(ForeignKey(Carrier.id), sort_order=ALIGN_4)
     carrier_name_raw: Mapped[Optional[str]] = mapped_column(String(255))
 
     # =========================================================================
@@ -209,8 +270,17 @@ class Referral(Base):
     # =========================================================================
     patient_first_name: Mapped[Optional[str]] = mapped_column(String(100))
     patient_last_name: Mapped[Optional[str]] = mapped_column(String(100))
-    patient_dob: Mapped[Optional[datetime]] = mapped_column(Date)
-    patient_doi: Mapped[Optional[datetime]] = mapped_column(Date)  # Date of injury
+    # Generated by the database from the first/last name on every write
+    patient_full_name: Mapped[Optional[str]] = mapped_column(
+        String(201),
+        Computed(
+            "trim(coalesce(patient_first_name, '') || ' ' || coalesce(patient_last_name, ''))",
+            persisted=True,
+        ),
+    )
+    patient_dob: Mapped[Optional[datetime]] = mapped_column(Date, sort_order=ALIGN_4)
+    # Date of injury
+    patient_doi: Mapped[Optional[datetime]] = mapped_column(Date, sort_order=ALIGN_4)
     patient_gender: Mapped[Optional[str]] = mapped_column(String(20))
     patient_phone: Mapped[Optional[str]] = mapped_column(String(50))
     patient_email: Mapped[Optional[str]] = mapped_column(String(255))
@@ -255,31 +325,39 @@ class Referral(Base):
     # =========================================================================
     # RX (PRESCRIPTION) ATTACHMENT
     # =========================================================================
+    # attachments.referral_id points back here; use_alter breaks the cycle for DDL ordering
     rx_attachment_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("attachments.id"), nullable=True
+        BIG_ID,
+        ForeignKey("attachments.id", use_alter=True, name="fk_referrals_rx_attachment_id"),
+        nullable=True,
+        sort_order=ALIGN_8,
     )
 
     # =========================================================================
     # STATUS & WORKFLOW
     # =========================================================================
     status: Mapped[ReferralStatus] = mapped_column(
-        Enum(ReferralStatus), default=ReferralStatus.DRAFT, index=True
+        REFERRAL_STATUS_TYPE, default=ReferralStatus.DRAFT, sort_order=ALIGN_2
+    )  # Indexed as the leading column of ix_referrals_status_received
+    priority: Mapped[Priority] = mapped_column(
+        PRIORITY_TYPE, default=Priority.MEDIUM, sort_order=ALIGN_2
     )
-    priority: Mapped[Priority] = mapped_column(Enum(Priority), default=Priority.MEDIUM)
 
     # =========================================================================
     # EXTRACTION METADATA
     # =========================================================================
-    extraction_confidence: Mapped[float] = mapped_column(Float, default=0.0)
-    extraction_data: Mapped[Optional[dict]] = mapped_column(JSON)
-    needs_human_review: Mapped[bool] = mapped_column(Boolean, default=True)
+    extraction_confidence: Mapped[float] = mapped_column(Float, default=0.0, sort_order=ALIGN_8)
+    extraction_data: Mapped[Optional[dict]] = mapped_column(JSON_DOCUMENT)
+    needs_human_review: Mapped[bool] = mapped_column(Boolean, default=True, sort_order=ALIGN_1)
     review_notes: Mapped[Optional[str]] = mapped_column(Text)
 
     # =========================================================================
     # FILEMAKER INTEGRATION
     # =========================================================================
     filemaker_record_id: Mapped[Optional[str]] = mapped_column(String(100))
-    filemaker_submitted_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    filemaker_submitted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, sort_order=ALIGN_8
+    )
 
     # =========================================================================
     # NOTES & REJECTION
@@ -290,13 +368,19 @@ class Referral(Base):
     # =========================================================================
     # TIMESTAMPS
     # =========================================================================
-    received_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    validated_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    scheduled_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    received_at: Mapped[Optional[datetime]] = mapped_column(DateTime, sort_order=ALIGN_8)
+    validated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, sort_order=ALIGN_8)
+    scheduled_at: Mapped[Optional[datetime]] = mapped_column(DateTime, sort_order=ALIGN_8)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, sort_order=ALIGN_8)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now(), sort_order=ALIGN_8
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime,
+        default=utc_now(),
+        server_default=utc_now(),
+        onupdate=utc_now(),
+        sort_order=ALIGN_8,
     )
 
     # =========================================================================
@@ -305,17 +389,21 @@ class Referral(Base):
     source_email: Mapped[Optional["Email"]] = relationship(
         "Email", back_populates="referral"
     )
+    # Read on nearly every referral view, so joined into the referral query
     carrier: Mapped[Optional["Carrier"]] = relationship(
-        "Carrier", back_populates="referrals"
+        "Carrier", back_populates="referrals", lazy="joined"
     )
+    # Line items are loaded with the referral in one batched IN query; queue
+    # items, audit logs and uploaded attachments are read through their
+    # services, never per referral
     line_items: Mapped[list["ReferralLineItem"]] = relationship(
-        "ReferralLineItem", back_populates="referral", cascade="all, delete-orphan"
+        "ReferralLineItem", back_populates="referral", cascade="all, delete-orphan", lazy="selectin"
     )
     queue_items: Mapped[list["QueueItem"]] = relationship(
-        "QueueItem", back_populates="referral", cascade="all, delete-orphan"
+        "QueueItem", back_populates="referral", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
     audit_logs: Mapped[list["AuditLog"]] = relationship(
-        "AuditLog", back_populates="referral", cascade="all, delete-orphan"
+        "AuditLog", back_populates="referral", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
     # RX attachment relationship
     rx_attachment: Mapped[Optional["Attachment"]] = relationship(
@@ -327,24 +415,12 @@ class Referral(Base):
         foreign_keys="Attachment.referral_id",
         back_populates="referral",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
 
-    # =========================================================================
-    # COMPUTED PROPERTIES
-    # =========================================================================
-    @property
-    def attachments(self) -> list["Attachment"]:
-        """Get attachments from the source email."""
-        return self.source_email.attachments if self.source_email else []
-
-    @property
-    def patient_full_name(self) -> str:
-        """Get patient's full name."""
-        parts = [self.patient_first_name, self.patient_last_name]
-        return " ".join(p for p in parts if p)
-
     def __repr__(self) -> str:
-        return f"<Referral(id={self.id}, claim={self.claim_number}, status={self.status.value})>"
+        status = self.status.name if self.status else None
+        return f"<Referral(id={self.id}, claim={self.claim_number}, status={status})>"
 
 
 # =============================================================================
@@ -362,14 +438,25 @@ class ReferralLineItem(Base):
     - CT scan right shoulder with contrast
 
     Each line item has its own ICD-10, CPT, status, and scheduling.
+    Notes and special instructions are capped at NOTES_MAX_LENGTH characters.
     """
 
     __tablename__ = "referral_line_items"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    referral_id: Mapped[int] = mapped_column(
-        ForeignKey("referrals.id"), nullable=False, index=True
+    __table_args__ = (
+        # A referral's line items in display order (also serves referral_id lookups)
+        Index("ix_referral_line_items_referral_line", "referral_id", "line_number"),
+        # Provider worklists: WHERE provider_id = ? AND status = ?
+        Index("ix_referral_line_items_provider_status", "provider_id", "status"),
+        _max_length_check(
+            "special_instructions", "ck_referral_line_items_special_instructions_length"
+        ),
+        _max_length_check("notes", "ck_referral_line_items_notes_length"),
     )
+    # Fetch SQL-generated timestamps with RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    id: Mapped[int] = mapped_column(BIG_ID, Identity(), primary_key=True)
+    referral_id: Mapped[int] = mapped_column(ForeignKey(Referral.id), nullable=False)
 
     # Line number for ordering
     line_number: Mapped[int] = mapped_column(Integer, default=1)
@@ -387,7 +474,7 @@ class ReferralLineItem(Base):
     body_region_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("dim_body_regions.id")
     )
-    modality: Mapped[Optional[ServiceModality]] = mapped_column(Enum(ServiceModality))
+    modality: Mapped[Optional[ServiceModality]] = mapped_column(SERVICE_MODALITY_TYPE)
 
     # Service modifiers
     with_contrast: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -425,7 +512,7 @@ class ReferralLineItem(Base):
     # =========================================================================
     # PROVIDER ASSIGNMENT
     # =========================================================================
-    provider_id: Mapped[Optional[int]] = mapped_column(ForeignKey("providers.id"))
+    provider_id: Mapped[Optional[int]] = mapped_column(ForeignKey(Provider.id))
     assigned_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
     # =========================================================================
@@ -439,7 +526,7 @@ class ReferralLineItem(Base):
     # PRICING
     # =========================================================================
     rate_schedule_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("rate_schedules.id")
+        ForeignKey(RateSchedule.id)
     )
     unit_rate: Mapped[Optional[float]] = mapped_column(Float)
     quantity: Mapped[int] = mapped_column(Integer, default=1)
@@ -449,7 +536,7 @@ class ReferralLineItem(Base):
     # STATUS
     # =========================================================================
     status: Mapped[LineItemStatus] = mapped_column(
-        Enum(LineItemStatus), default=LineItemStatus.PENDING
+        LINE_ITEM_STATUS_TYPE, default=LineItemStatus.PENDING
     )
 
     # =========================================================================
@@ -467,9 +554,11 @@ class ReferralLineItem(Base):
     # =========================================================================
     # TIMESTAMPS
     # =========================================================================
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utc_now(), server_default=utc_now(), onupdate=utc_now()
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
@@ -487,7 +576,9 @@ class ReferralLineItem(Base):
     procedure: Mapped[Optional["DimProcedureCode"]] = relationship("DimProcedureCode")
 
     def __repr__(self) -> str:
-        return f"<ReferralLineItem(id={self.id}, desc='{self.service_description[:30]}...', status={self.status.value})>"
+        desc = (self.service_description or "")[:30]
+        status = self.status.name if self.status else None
+        return f"<ReferralLineItem(id={self.id}, desc='{desc}...', status={status})>"
 
 
 # =============================================================================
@@ -500,16 +591,18 @@ class ReplyTemplate(Base):
 
     __tablename__ = "reply_templates"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     label: Mapped[str] = mapped_column(String(100), nullable=False)
     subject_template: Mapped[Optional[str]] = mapped_column(String(500))
     body_template: Mapped[str] = mapped_column(Text, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     sort_order: Mapped[int] = mapped_column(Integer, default=0)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utc_now(), server_default=utc_now(), onupdate=utc_now()
     )
 
 
@@ -519,21 +612,65 @@ class ReplyTemplate(Base):
 
 
 class AuditLog(Base):
-    """Audit trail for referral changes."""
+    """
+    Audit trail for referral changes.
+
+    Field changes are kept in one JSON document per entry,
+    {"<field>": {"old": ..., "new": ...}}, which can be searched with GIN
+    containment queries on PostgreSQL (e.g. status changed to "rejected").
+    Notes are capped at NOTES_MAX_LENGTH characters.
+    """
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # A referral's history, newest first (read backwards, so no sort step)
+        Index("ix_audit_logs_referral_timestamp", "referral_id", "timestamp"),
+        Index("ix_audit_logs_changes", "changes", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        _max_length_check("notes", "ck_audit_logs_notes_length"),
+    )
+    # Write-only from the ORM's side: nothing reads an entry back after logging it
+    __mapper_args__ = {"eager_defaults": False}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIG_ID, Identity(), primary_key=True)
     referral_id: Mapped[int] = mapped_column(
-        ForeignKey("referrals.id"), nullable=False
+        ForeignKey(Referral.id), nullable=False
     )
     action: Mapped[str] = mapped_column(String(50), nullable=False)
-    field_name: Mapped[Optional[str]] = mapped_column(String(100))
-    old_value: Mapped[Optional[str]] = mapped_column(Text)
-    new_value: Mapped[Optional[str]] = mapped_column(Text)
+    changes: Mapped[dict] = mapped_column(
+        JSON_DOCUMENT, nullable=False, default=dict, server_default="{}"
+    )
     user: Mapped[Optional[str]] = mapped_column(String(255))
-    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now(), server_default=utc_now()
+    )
     notes: Mapped[Optional[str]] = mapped_column(Text)
 
     # Relationships
     referral: Mapped["Referral"] = relationship("Referral", back_populates="audit_logs")
+
+    @staticmethod
+    def field_change(field_name: str, old_value: Optional[str], new_value: Optional[str]) -> dict:
+        """Build the `changes` document for a single-field change."""
+        return {field_name: {"old": old_value, "new": new_value}}
+
+    # Single-field views of `changes`, for display
+    @property
+    def field_name(self) -> Optional[str]:
+        return next(iter(self.changes), None) if self.changes else None
+
+    @property
+    def old_value(self) -> Optional[str]:
+        field_name = self.field_name
+        return self.changes[field_name].get("old") if field_name else None
+
+    @property
+    def new_value(self) -> Optional[str]:
+        field_name = self.field_name
+        return self.changes[field_name].get("new") if field_name else None
+
+    @classmethod
+    def bulk_insert_copy(cls, session: Session, rows: Sequence[dict]) -> int:
+        """Append audit entries in bulk (COPY on PostgreSQL, executemany elsewhere)."""
+        return copy_insert(session, cls, rows)
@@ -0,0 +1,193 @@
+"""
+Custom column types.
+"""
+
+import enum
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import JSON, BigInteger, CheckConstraint, DateTime, Integer, SmallInteger, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+# Shared string/text column types, reused instead of building a new type per column
+STR_20 = String(20)
+STR_100 = String(100)
+STR_255 = String(255)
+STR_500 = String(500)
+TEXT = Text()
+
+# 64-bit surrogate key for append-only tables that can outgrow INTEGER. SQLite
+# keeps INTEGER, since only an INTEGER PRIMARY KEY is the auto-assigned rowid.
+BIG_ID = BigInteger().with_variant(Integer(), "sqlite")
+
+# DDL column positions (mapped_column sort_order) for tight PostgreSQL row
+# packing: 8-byte fixed-width columns first, then 4-, 2- and 1-byte ones, so
+# no alignment padding falls between them; variable-length columns keep the
+# default sort_order of 0 and follow in declaration order
+ALIGN_8 = -4
+ALIGN_4 = -3
+ALIGN_2 = -2
+ALIGN_1 = -1
+
+# JSON document column: binary JSONB (indexable with GIN) on PostgreSQL,
+# the generic JSON type elsewhere
+JSON_DOCUMENT = JSON().with_variant(JSONB(), "postgresql")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class EpochMicros(TypeDecorator):
+    """
+    Timestamp stored as a BIGINT of microseconds since the Unix epoch.
+
+    Exposes naive UTC datetimes in Python, like the DateTime columns elsewhere.
+    Aware datetimes are converted to UTC; naive ones are assumed to be UTC.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[int]:
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return (value - _EPOCH) // _MICROSECOND
+
+    def process_result_value(self, value, dialect) -> Optional[datetime]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Row written before the column was converted from DateTime
+            return datetime.fromisoformat(value)
+        return _EPOCH + timedelta(microseconds=value)
+
+
+class utc_epoch_micros(FunctionElement):
+    """
+    SQL expression for the current UTC time in epoch microseconds.
+
+    The database-side counterpart of `datetime.utcnow` for EpochMicros
+    columns, usable as a column default / server_default / onupdate.
+    """
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(utc_epoch_micros)
+def _compile_utc_epoch_micros(element, compiler, **kw) -> str:
+    return "CAST(EXTRACT(EPOCH FROM CURRENT_TIMESTAMP) * 1000000 AS BIGINT)"
+
+
+@compiles(utc_epoch_micros, "sqlite")
+def _compile_utc_epoch_micros_sqlite(element, compiler, **kw) -> str:
+    # julianday() of the Unix epoch is 2440587.5; 'now' is UTC
+    return "CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER)"
+
+
+class utc_now(FunctionElement):
+    """
+    SQL expression for the current UTC time, for DateTime columns.
+
+    Unlike func.now(), the value is UTC on PostgreSQL regardless of the
+    session time zone (the columns are naive), and keeps sub-second
+    precision on SQLite, whose CURRENT_TIMESTAMP is whole seconds.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_now)
+def _compile_utc_now(element, compiler, **kw) -> str:
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utc_now, "sqlite")
+def _compile_utc_now_sqlite(element, compiler, **kw) -> str:
+    # Millisecond precision, in the format SQLAlchemy stores datetimes in
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+class CodedEnum(TypeDecorator):
+    """
+    Enum stored as a short (typically one-character) code instead of the member name.
+
+    Values written before a column was converted (member names) still load.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(
+        self,
+        enum_class: type[enum.Enum],
+        codes: dict[enum.Enum, str],
+        length: Optional[int] = None,
+    ):
+        super().__init__(length=length or max(len(code) for code in codes.values()))
+        self._set_codes(enum_class, codes)
+
+    def _set_codes(self, enum_class: type[enum.Enum], codes: dict) -> None:
+        self.enum_class = enum_class
+        self.codes = tuple(codes.items())
+        self._to_code = dict(codes)
+        self._from_code = {code: member for member, code in codes.items()}
+
+    def check_constraint(self, column: str, name: str) -> CheckConstraint:
+        """Build a CHECK constraint limiting `column` to the known codes."""
+        allowed = ", ".join(repr(code) for code in self._from_code)
+        return CheckConstraint(f"{column} IN ({allowed})", name=name)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # Members (and, for str enums, their plain values) hit the dict directly
+        code = self._to_code.get(value)
+        if code is None:
+            code = self._to_code[self.enum_class[value]]
+        return code
+
+    def process_result_value(self, value, dialect) -> Optional[enum.Enum]:
+        if value is None:
+            return None
+        member = self._from_code.get(value)
+        return member if member is not None else self.enum_class[value]
+
+
+class NamedEnum(CodedEnum):
+    """
+    Enum stored by member name, as SQLAlchemy's Enum type stores it.
+
+    Rows decode with a single dict lookup from name to member rather than
+    going through the generic Enum type's processors. The column is a plain
+    VARCHAR (no native ENUM type on PostgreSQL) with room to spare, so adding
+    a member never needs a schema change.
+    """
+
+    cache_ok = True
+
+    def __init__(self, enum_class: type[enum.Enum], length: int = 32):
+        super().__init__(enum_class, {member: member.name for member in enum_class}, length)
+
+
+class IntCodedEnum(CodedEnum):
+    """
+    Enum stored as a SMALLINT code.
+
+    Integer compares and a two-byte key keep indexes on hot status/priority
+    columns small. Codes are assigned explicitly and must never be reused;
+    values stored by member name before a column was converted still load.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[enum.Enum], codes: dict[enum.Enum, int]):
+        TypeDecorator.__init__(self)
+        self._set_codes(enum_class, codes)
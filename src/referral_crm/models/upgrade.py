@@ -0,0 +1,404 @@
+"""
+In-place upgrades for databases created by earlier releases.
+
+create_all() only creates tables that do not exist yet. upgrade_schema()
+then brings existing tables in line with the models: it converts columns
+whose storage changed (enum member names to codes, DATETIME to epoch
+microseconds, INTEGER keys to BIGINT, JSON to JSONB), adds new columns, and
+creates the CHECK constraints and indexes that are missing. Every step is
+derived from the difference between the live schema and the models, so
+running it again on an upgraded database does nothing.
+
+PostgreSQL is altered column by column in a single transaction. SQLite
+cannot change a column's type or add a constraint, so a table that differs
+is rebuilt inside one transaction: renamed aside, recreated from the model,
+copied across with the same conversions, and dropped.
+
+CHECK constraints are not applied to rows that already exist (NOT VALID on
+PostgreSQL, ignore_check_constraints during the SQLite copy); they hold for
+every write from then on.
+"""
+
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import CheckConstraint, Column, Connection, Engine, MetaData, Table, inspect, text
+from sqlalchemy.engine import Dialect
+from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateTable
+
+from referral_crm.models.types import CodedEnum, EpochMicros
+
+logger = logging.getLogger(__name__)
+
+# SQL filling a column added to an existing table, by (table, column) and
+# dialect name. A new NOT NULL column without a server default needs one.
+_BACKFILLS: dict[tuple[str, str], dict[str, str]] = {
+    # ITEM_KIND_EMAIL (0) for email items, ITEM_KIND_REFERRAL (1) otherwise;
+    # filled before ck_queue_items_item_kind is added
+    ("queue_items", "item_kind"): {
+        "sqlite": "CASE WHEN email_id IS NOT NULL THEN 0 ELSE 1 END",
+        "postgresql": "CASE WHEN email_id IS NOT NULL THEN 0 ELSE 1 END",
+    },
+    # The single field_name/old_value/new_value change, as AuditLog.field_change()
+    # builds it; entries without a field_name get an empty document
+    ("audit_logs", "changes"): {
+        "sqlite": (
+            "CASE WHEN field_name IS NULL THEN '{}' ELSE json_object("
+            "field_name, json_object('old', old_value, 'new', new_value)) END"
+        ),
+        "postgresql": (
+            "CASE WHEN field_name IS NULL THEN '{}'::jsonb ELSE jsonb_build_object("
+            "field_name, jsonb_build_object('old', old_value, 'new', new_value)) END"
+        ),
+    },
+}
+
+# Columns removed from the models whose data a _BACKFILLS entry carries over,
+# by table; they are dropped once that has run. A table with any other
+# column the models no longer map is left alone.
+_REPLACED_COLUMNS: dict[str, tuple[str, ...]] = {
+    "audit_logs": ("field_name", "old_value", "new_value"),
+}
+
+# Type names that differ between the models and reflection but are the same
+_SAME_TYPE = {"FLOAT": "DOUBLE PRECISION"}
+
+# Run on SQLite after the tables are upgraded, for schema objects that
+# create_all() only makes along with a new table (e.g. FTS5 indexes, which a
+# table rebuild also loses). Each takes the connection and must be idempotent.
+_SQLITE_STEPS: list[Callable[[Connection], None]] = []
+
+
+def register_sqlite_step(step: Callable[[Connection], None]) -> Callable[[Connection], None]:
+    """Register an idempotent SQLite upgrade step (usable as a decorator)."""
+    _SQLITE_STEPS.append(step)
+    return step
+
+
+def upgrade_schema(engine: Engine, metadata: MetaData) -> None:
+    """Bring existing tables in line with `metadata` (see the module docstring)."""
+    if engine.dialect.name == "sqlite":
+        _upgrade_sqlite(engine, metadata)
+    elif engine.dialect.name == "postgresql":
+        _upgrade_postgresql(engine, metadata)
+
+
+# =============================================================================
+# PLANNING
+# =============================================================================
+
+
+class _TablePlan:
+    """What differs between one existing table and its model."""
+
+    def __init__(self, table: Table, inspector: Inspector, dialect: Dialect):
+        self.table = table
+        self.live_columns = {c["name"]: c for c in inspector.get_columns(table.name)}
+        self.new_columns = [c for c in table.columns if c.name not in self.live_columns]
+        self.changed_columns = [
+            c
+            for c in table.columns
+            if c.name in self.live_columns
+            and _type_name(c.type, dialect) != _type_name(self.live_columns[c.name]["type"], dialect)
+        ]
+        unmapped = [name for name in self.live_columns if name not in table.columns]
+        replaced = _REPLACED_COLUMNS.get(table.name, ())
+        self.replaced_columns = [name for name in unmapped if name in replaced]
+        self.unmapped_columns = [name for name in unmapped if name not in replaced]
+
+        self.missing_defaults = [
+            c
+            for c in table.columns
+            if c.server_default is not None
+            and c.computed is None
+            and c.identity is None
+            and c.name in self.live_columns
+            and self.live_columns[c.name]["default"] is None
+        ]
+
+        live_checks = {c["name"] for c in inspector.get_check_constraints(table.name)}
+        self.missing_checks = [
+            c
+            for c in table.constraints
+            if isinstance(c, CheckConstraint) and c.name and c.name not in live_checks
+        ]
+
+    def unfillable_columns(self, dialect: Dialect) -> list[str]:
+        """New NOT NULL columns that nothing can give a value to."""
+        return [
+            c.name
+            for c in self.new_columns
+            if not c.nullable
+            and c.server_default is None
+            and c.computed is None
+            and _backfill(c, dialect) is None
+        ]
+
+    @property
+    def changed(self) -> bool:
+        """Whether the table itself (not just its indexes) needs upgrading."""
+        return bool(
+            self.new_columns
+            or self.changed_columns
+            or self.replaced_columns
+            or self.missing_defaults
+            or self.missing_checks
+        )
+
+
+def _plan(connection: Connection, metadata: MetaData) -> list[_TablePlan]:
+    """Plans for the existing tables that need upgrading and can be upgraded."""
+    dialect = connection.dialect
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    plans = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        plan = _TablePlan(table, inspector, dialect)
+        if not plan.changed:
+            continue
+        blockers = plan.unmapped_columns + plan.unfillable_columns(dialect)
+        if blockers:
+            logger.warning(
+                "Not upgrading table %s: no upgrade step for column(s) %s",
+                table.name,
+                ", ".join(blockers),
+            )
+            continue
+        plans.append(plan)
+    return plans
+
+
+def _type_name(column_type, dialect: Dialect) -> str:
+    name = column_type.compile(dialect=dialect)
+    return _SAME_TYPE.get(name, name)
+
+
+def _backfill(column: Column, dialect: Dialect) -> Optional[str]:
+    return _BACKFILLS.get((column.table.name, column.name), {}).get(dialect.name)
+
+
+def _convert(column: Column, source: str, dialect: Dialect) -> str:
+    """SQL converting `source`, stored under the column's old type, to its model type."""
+    target = column.type.compile(dialect=dialect)
+    column_type = column.type
+
+    if isinstance(column_type, CodedEnum):
+        # Enum columns held member names (a native ENUM on PostgreSQL)
+        as_text = f"CAST({source} AS TEXT)"
+        whens = " ".join(
+            f"WHEN '{member.name}' THEN {code!r}"
+            for member, code in column_type.codes
+            if member.name != code
+        )
+        if not whens:
+            return f"CAST({as_text} AS {target})"
+        return f"CASE {as_text} {whens} ELSE CAST({as_text} AS {target}) END"
+
+    if isinstance(column_type, EpochMicros):
+        if dialect.name == "sqlite":
+            # Stored as 'YYYY-MM-DD HH:MM:SS[.ffffff]' text
+            micros = (
+                f"CAST(strftime('%s', {source}) AS INTEGER) * 1000000"
+                f" + CASE WHEN length({source}) > 20"
+                f" THEN CAST(substr({source} || '000000', 21, 6) AS INTEGER) ELSE 0 END"
+            )
+            return f"CASE WHEN typeof({source}) = 'text' THEN {micros} ELSE {source} END"
+        # EXTRACT(EPOCH) of a naive timestamp reads it as UTC
+        return f"CAST(EXTRACT(EPOCH FROM {source}) * 1000000 AS BIGINT)"
+
+    if dialect.name == "sqlite":
+        # Column affinity converts the value on insert
+        return source
+    return f"CAST({source} AS {target})"
+
+
+def _sync_indexes(connection: Connection, metadata: MetaData) -> None:
+    """Create missing model indexes; drop ix_ indexes the models no longer declare."""
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    quote = connection.dialect.identifier_preparer.quote
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        live = {i["name"] for i in inspector.get_indexes(table.name)}
+        declared = {i.name for i in table.indexes}
+        for name in sorted(live - declared):
+            if name.startswith(f"ix_{table.name}_"):
+                connection.exec_driver_sql(f"DROP INDEX {quote(name)}")
+        # A table _plan() left alone may still lack an indexed column
+        live_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if index.name not in live and all(c.name in live_columns for c in index.columns):
+                index.create(connection)
+
+
+# =============================================================================
+# SQLITE
+# =============================================================================
+
+
+def _upgrade_sqlite(engine: Engine, metadata: MetaData) -> None:
+    # Autocommit at the driver level, so the rebuild can run in an explicit
+    # transaction with foreign keys off (the pragma is a no-op inside one)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        plans = _plan(connection, metadata)
+        if plans:
+            _rebuild_sqlite_tables(connection, plans)
+        _sync_indexes(connection, metadata)
+        for step in _SQLITE_STEPS:
+            step(connection)
+
+
+def _rebuild_sqlite_tables(connection: Connection, plans: list[_TablePlan]) -> None:
+    run = connection.exec_driver_sql
+    # Keep other tables' REFERENCES clauses pointing at the table name
+    # rather than following it to the renamed-aside copy
+    run("PRAGMA foreign_keys=OFF")
+    run("PRAGMA legacy_alter_table=ON")
+    run("PRAGMA ignore_check_constraints=ON")
+    run("BEGIN")
+    try:
+        for plan in plans:
+            _rebuild_sqlite_table(connection, plan)
+        violations = run("PRAGMA foreign_key_check").all()
+        if violations:
+            raise RuntimeError(f"Schema upgrade broke foreign keys: {violations[:5]}")
+        run("COMMIT")
+    except Exception:
+        run("ROLLBACK")
+        raise
+    finally:
+        run("PRAGMA ignore_check_constraints=OFF")
+        run("PRAGMA legacy_alter_table=OFF")
+        run("PRAGMA foreign_keys=ON")
+
+
+def _rebuild_sqlite_table(connection: Connection, plan: _TablePlan) -> None:
+    dialect = connection.dialect
+    quote = dialect.identifier_preparer.quote
+    table = plan.table
+    name = quote(table.name)
+    old_name = quote(f"_upgrade_{table.name}")
+
+    connection.exec_driver_sql(f"ALTER TABLE {name} RENAME TO {old_name}")
+    connection.execute(CreateTable(table))
+
+    targets, sources = [], []
+    for column in table.columns:
+        if column.computed is not None:
+            continue
+        if column.name in plan.live_columns:
+            source = quote(column.name)
+            if column in plan.changed_columns:
+                source = _convert(column, source, dialect)
+        else:
+            source = _backfill(column, dialect)
+            if source is None:
+                continue  # column default
+        targets.append(quote(column.name))
+        sources.append(source)
+
+    connection.exec_driver_sql(
+        f"INSERT INTO {name} ({', '.join(targets)}) "
+        f"SELECT {', '.join(sources)} FROM {old_name}"
+    )
+    # Drops the old indexes too; _sync_indexes recreates them
+    connection.exec_driver_sql(f"DROP TABLE {old_name}")
+    logger.info("Upgraded table %s", table.name)
+
+
+# =============================================================================
+# POSTGRESQL
+# =============================================================================
+
+
+def _upgrade_postgresql(engine: Engine, metadata: MetaData) -> None:
+    with engine.begin() as connection:
+        for plan in _plan(connection, metadata):
+            _alter_postgresql_table(connection, plan)
+        _sync_indexes(connection, metadata)
+        _drop_unused_enum_types(connection, metadata)
+
+
+def _alter_postgresql_table(connection: Connection, plan: _TablePlan) -> None:
+    dialect = connection.dialect
+    quote = dialect.identifier_preparer.quote
+    table = plan.table
+    alter = f"ALTER TABLE {quote(table.name)}"
+    run = connection.exec_driver_sql
+
+    for column in plan.new_columns:
+        backfill = _backfill(column, dialect)
+        if backfill is None:
+            run(f"{alter} ADD COLUMN {CreateColumn(column).compile(dialect=dialect)}")
+            continue
+        # Add it nullable, fill it from the existing row, then constrain it
+        run(f"{alter} ADD COLUMN {quote(column.name)} {column.type.compile(dialect=dialect)}")
+        run(f"UPDATE {quote(table.name)} SET {quote(column.name)} = {backfill}")
+        if not column.nullable:
+            run(f"{alter} ALTER COLUMN {quote(column.name)} SET NOT NULL")
+
+    for name in plan.replaced_columns:
+        run(f"{alter} DROP COLUMN {quote(name)}")
+
+    for column in plan.changed_columns:
+        name = quote(column.name)
+        if plan.live_columns[column.name]["default"] is not None and not column.primary_key:
+            # The old default may not cast; the model's is set below
+            run(f"{alter} ALTER COLUMN {name} DROP DEFAULT")
+        run(
+            f"{alter} ALTER COLUMN {name} TYPE {column.type.compile(dialect=dialect)}"
+            f" USING {_convert(column, name, dialect)}"
+        )
+        # A SERIAL key's sequence is INTEGER too
+        sequence = connection.execute(
+            text("SELECT pg_get_serial_sequence(:table, :column)"),
+            {"table": table.name, "column": column.name},
+        ).scalar()
+        if sequence:
+            run(f"ALTER SEQUENCE {sequence} AS {column.type.compile(dialect=dialect)}")
+
+    ddl = dialect.ddl_compiler(dialect, None)
+    for column in table.columns:
+        if column.server_default is None or column.computed is not None or column.identity is not None:
+            continue
+        if (
+            column in plan.missing_defaults
+            or column in plan.changed_columns
+            or (column in plan.new_columns and _backfill(column, dialect) is not None)
+        ):
+            run(
+                f"{alter} ALTER COLUMN {quote(column.name)}"
+                f" SET DEFAULT {ddl.get_column_default_string(column)}"
+            )
+
+    for constraint in plan.missing_checks:
+        run(f"{AddConstraint(constraint).compile(dialect=dialect)} NOT VALID")
+
+    logger.info("Upgraded table %s", table.name)
+
+
+def _drop_unused_enum_types(connection: Connection, metadata: MetaData) -> None:
+    """Drop the native ENUM types that enum columns used before they held codes."""
+    names = sorted(
+        {
+            column.type.enum_class.__name__.lower()
+            for table in metadata.tables.values()
+            for column in table.columns
+            if isinstance(column.type, CodedEnum)
+        }
+    )
+    unused = connection.execute(
+        text(
+            "SELECT t.typname FROM pg_type t"
+            " WHERE t.typtype = 'e' AND t.typname = ANY(:names)"
+            " AND NOT EXISTS (SELECT 1 FROM pg_attribute a WHERE a.atttypid = t.oid)"
+        ),
+        {"names": names},
+    ).scalars()
+    quote = connection.dialect.identifier_preparer.quote
+    for name in unused:
+        connection.exec_driver_sql(f"DROP TYPE {quote(name)}")
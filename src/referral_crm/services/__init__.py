@@ -1,36 +1,88 @@
 """
 Service layer for Referral CRM.
+
+Exports are loaded lazily (PEP 562): importing one service module no longer
+pulls in every other service and its client library (anthropic, msal, boto3).
 """
 
-from referral_crm.services.referral_service import ReferralService, CarrierService
-from referral_crm.services.extraction_service import ExtractionService, ExtractionResult, ExtractedField
-from referral_crm.services.email_service import EmailService
-from referral_crm.services.provider_service import ProviderService
-from referral_crm.services.storage_service import StorageService, get_storage_service
-from referral_crm.services.reference_data import ReferenceDataService, get_reference_data_service
-from referral_crm.services.reasoning_service import (
-    ReasoningService,
-    TwoStepExtractionPipeline,
-    get_reasoning_service,
-    get_extraction_pipeline,
-)
-from referral_crm.services.filemaker_conversion import (
-    FileMakerExtraction,
-    ExtractionToFileMakerConverter,
-    FileMakerPayloadValidator,
-    FieldTransformer,
-)
-from referral_crm.services.workflow_service import (
-    WorkflowService,
-    get_workflow_service,
-    seed_queues,
-)
-from referral_crm.services.line_item_service import (
-    LineItemService,
-    ServiceLineItemParser,
-    get_line_item_service,
-    seed_service_types,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from referral_crm.services.referral_service import ReferralService, CarrierService
+    from referral_crm.services.extraction_service import ExtractionService, ExtractionResult, ExtractedField
+    from referral_crm.services.email_service import AsyncEmailService, EmailService
+    from referral_crm.services.provider_service import ProviderService
+    from referral_crm.services.storage_service import StorageService, get_storage_service
+    from referral_crm.services.reference_data import ReferenceDataService, get_reference_data_service
+    from referral_crm.services.reasoning_service import (
+        ReasoningService,
+        TwoStepExtractionPipeline,
+        get_reasoning_service,
+        get_extraction_pipeline,
+    )
+    from referral_crm.services.filemaker_conversion import (
+        FileMakerExtraction,
+        ExtractionToFileMakerConverter,
+        FileMakerPayloadValidator,
+        FieldTransformer,
+    )
+    from referral_crm.services.workflow_service import (
+        WorkflowService,
+        get_workflow_service,
+        seed_queues,
+    )
+    from referral_crm.services.line_item_service import (
+        LineItemService,
+        ServiceLineItemParser,
+        get_line_item_service,
+        seed_service_types,
+    )
+
+_LAZY = {
+    "ReferralService": "referral_crm.services.referral_service",
+    "CarrierService": "referral_crm.services.referral_service",
+    "ExtractionService": "referral_crm.services.extraction_service",
+    "ExtractionResult": "referral_crm.services.extraction_service",
+    "ExtractedField": "referral_crm.services.extraction_service",
+    "EmailService": "referral_crm.services.email_service",
+    "AsyncEmailService": "referral_crm.services.email_service",
+    "ProviderService": "referral_crm.services.provider_service",
+    "StorageService": "referral_crm.services.storage_service",
+    "get_storage_service": "referral_crm.services.storage_service",
+    "ReferenceDataService": "referral_crm.services.reference_data",
+    "get_reference_data_service": "referral_crm.services.reference_data",
+    "ReasoningService": "referral_crm.services.reasoning_service",
+    "TwoStepExtractionPipeline": "referral_crm.services.reasoning_service",
+    "get_reasoning_service": "referral_crm.services.reasoning_service",
+    "get_extraction_pipeline": "referral_crm.services.reasoning_service",
+    "FileMakerExtraction": "referral_crm.services.filemaker_conversion",
+    "ExtractionToFileMakerConverter": "referral_crm.services.filemaker_conversion",
+    "FileMakerPayloadValidator": "referral_crm.services.filemaker_conversion",
+    "FieldTransformer": "referral_crm.services.filemaker_conversion",
+    "WorkflowService": "referral_crm.services.workflow_service",
+    "get_workflow_service": "referral_crm.services.workflow_service",
+    "seed_queues": "referral_crm.services.workflow_service",
+    "LineItemService": "referral_crm.services.line_item_service",
+    "ServiceLineItemParser": "referral_crm.services.line_item_service",
+    "get_line_item_service": "referral_crm.services.line_item_service",
+    "seed_service_types": "referral_crm.services.line_item_service",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY))
+
 
 __all__ = [
     # Core services
@@ -38,6 +90,7 @@ __all__ = [
     "CarrierService",
     "ExtractionService",
     "EmailService",
+    "AsyncEmailService",
     "ProviderService",
     "StorageService",
     "get_storage_service",
@@ -5,15 +5,29 @@ Handles email fetching, replies, and forwarding.
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import atexit
+import os
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import ClassVar, Iterator, Optional
+from urllib.parse import urlencode
 
 import httpx
+import orjson
 
-from referral_crm.config import get_settings
+from referral_crm.config import get_integrations_settings
+
+# SIMD base64 decoder when installed (the "speedups" extra); same API as stdlib
+try:
+    import pybase64 as b64
+except ImportError:
+    import base64 as b64
 
 # Lazy import for MSAL
 msal = None
@@ -29,7 +43,16 @@ def get_msal():
     return msal
 
 
-@dataclass
+# Message properties requested for EmailMessage
+MESSAGE_FIELDS = (
+    "id,subject,body,bodyPreview,from,receivedDateTime,webLink,"
+    "internetMessageId,conversationId,hasAttachments"
+)
+# Same without the (HTML-heavy) body, for metadata-only listings
+MESSAGE_METADATA_FIELDS = MESSAGE_FIELDS.replace("body,", "", 1)
+
+
+@dataclass(slots=True)
 class EmailMessage:
     """Represents an email message from Graph API."""
 
@@ -49,25 +72,30 @@ class EmailMessage:
     @classmethod
     def from_graph_response(cls, data: dict) -> "EmailMessage":
         """Create from a Graph API message response."""
+        get = data.get
+        body = get("body") or {}
+        sender = (get("from") or {}).get("emailAddress") or {}
+        received = get("receivedDateTime", "")
+        if received.endswith("Z"):
+            received = received[:-1] + "+00:00"
+
         return cls(
-            id=data.get("id", ""),
-            subject=data.get("subject", ""),
-            body_content=data.get("body", {}).get("content", ""),
-            body_content_type=data.get("body", {}).get("contentType", "text"),
-            body_preview=data.get("bodyPreview", ""),
-            from_name=data.get("from", {}).get("emailAddress", {}).get("name", ""),
-            from_email=data.get("from", {}).get("emailAddress", {}).get("address", ""),
-            received_datetime=datetime.fromisoformat(
-                data.get("receivedDateTime", "").replace("Z", "+00:00")
-            ),
-            web_link=data.get("webLink", ""),
-            internet_message_id=data.get("internetMessageId", ""),
-            conversation_id=data.get("conversationId", ""),
-            has_attachments=data.get("hasAttachments", False),
+            id=get("id", ""),
+            subject=get("subject", ""),
+            body_content=body.get("content", ""),
+            body_content_type=body.get("contentType", "text"),
+            body_preview=get("bodyPreview", ""),
+            from_name=sender.get("name", ""),
+            from_email=sender.get("address", ""),
+            received_datetime=datetime.fromisoformat(received),
+            web_link=get("webLink", ""),
+            internet_message_id=get("internetMessageId", ""),
+            conversation_id=get("conversationId", ""),
+            has_attachments=get("hasAttachments", False),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailAttachment:
     """Represents an email attachment from Graph API."""
 
@@ -82,7 +110,7 @@ class EmailAttachment:
         """Create from a Graph API attachment response."""
         content_bytes = None
         if "contentBytes" in data:
-            content_bytes = base64.b64decode(data["contentBytes"])
+            content_bytes = b64.b64decode(data["contentBytes"])
 
         return cls(
             id=data.get("id", ""),
@@ -93,15 +121,45 @@ class EmailAttachment:
         )
 
 
+class _GraphAuth(httpx.Auth):
+    """Bearer-token auth for Graph requests; on a 401, gets a new token and retries once."""
+
+    def __init__(self, service: "EmailService"):
+        self._service = service
+
+    def auth_flow(self, request: httpx.Request) -> Iterator[httpx.Request]:
+        request.headers["Authorization"] = self._service.get_auth_header()
+        response = yield request
+
+        if response.status_code == 401:
+            # Token revoked or expired early; drop it and try once more
+            self._service._access_token = None
+            request.headers["Authorization"] = self._service.get_auth_header()
+            yield request
+
+
 class EmailService:
     """Service for interacting with Microsoft Graph API for email operations."""
 
     GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+    # Most requests one Graph JSON batch may carry
+    BATCH_LIMIT = 20
+
+    # Shared across instances so every Graph call reuses pooled connections
+    _client: ClassVar[Optional[httpx.Client]] = None
+    _client_lock: ClassVar[threading.Lock] = threading.Lock()
 
     def __init__(self):
-        self.settings = get_settings()
+        self.settings = get_integrations_settings()
         self._access_token: Optional[str] = None
-        self._token_expires_at: Optional[datetime] = None
+        # "Bearer <token>", built once per token
+        self._auth_header: Optional[str] = None
+        # time.monotonic() deadline for refreshing _access_token
+        self._token_expires_monotonic: float = 0.0
+        self._token_lock = threading.Lock()
+        self._auth = _GraphAuth(self)
+        # Resolved folder IDs by (mailbox, folder_path)
+        self._folder_id_cache: dict[tuple[Optional[str], str], str] = {}
 
     def is_configured(self) -> bool:
         """Check if Microsoft Graph API is configured."""
@@ -113,41 +171,78 @@ class EmailService:
 
     def get_access_token(self) -> str:
         """Get a valid access token, refreshing if necessary."""
+        # Fast path, run before every Graph request: a cached, unexpired token
+        token = self._access_token
+        if token is not None and time.monotonic() < self._token_expires_monotonic:
+            return token
+
         if not self.is_configured():
             raise ValueError("Microsoft Graph API not configured")
 
-        # Check if we have a valid token
-        if self._access_token and self._token_expires_at:
-            if datetime.utcnow() < self._token_expires_at:
-                return self._access_token
-
-        # Get new token using client credentials flow
-        msal_lib = get_msal()
-        app = msal_lib.ConfidentialClientApplication(
-            self.settings.graph_client_id,
-            authority=f"https://login.microsoftonline.com/{self.settings.graph_tenant_id}",
-            client_credential=self.settings.graph_client_secret,
-        )
+        # Worker threads share this service; the first to get here refreshes
+        # the token and the others wait for it rather than each calling MSAL
+        with self._token_lock:
+            token = self._access_token
+            if token is not None and time.monotonic() < self._token_expires_monotonic:
+                return token
+
+            # Get new token using client credentials flow
+            msal_lib = get_msal()
+            app = msal_lib.ConfidentialClientApplication(
+                self.settings.graph_client_id,
+                authority=f"https://login.microsoftonline.com/{self.settings.graph_tenant_id}",
+                client_credential=self.settings.graph_client_secret,
+            )
+
+            result = app.acquire_token_for_client(
+                scopes=["https://graph.microsoft.com/.default"]
+            )
+
+            if "access_token" not in result:
+                raise ValueError(f"Failed to acquire token: {result.get('error_description')}")
+
+            # A fast-path reader racing this may still get the previous token,
+            # which stays valid through the five-minute buffer
+            self._auth_header = f"Bearer {result['access_token']}"
+            self._access_token = result["access_token"]
+            # Refresh five minutes before the token actually expires
+            self._token_expires_monotonic = (
+                time.monotonic() + result.get("expires_in", 3600) - 300
+            )
+
+            return self._access_token
+
+    def get_auth_header(self) -> str:
+        """Get the Authorization header value for a valid access token."""
+        self.get_access_token()
+        return self._auth_header
 
-        result = app.acquire_token_for_client(
-            scopes=["https://graph.microsoft.com/.default"]
-        )
-
-        if "access_token" not in result:
-            raise ValueError(f"Failed to acquire token: {result.get('error_description')}")
-
-        self._access_token = result["access_token"]
-        # Token typically valid for 1 hour, set expiry a bit earlier to be safe
-        self._token_expires_at = datetime.utcnow().replace(minute=55)
-
-        return self._access_token
-
-    def _get_headers(self) -> dict:
-        """Get headers for Graph API requests."""
-        return {
-            "Authorization": f"Bearer {self.get_access_token()}",
-            "Content-Type": "application/json",
-        }
+    @classmethod
+    def _get_client(cls) -> httpx.Client:
+        """Get the shared HTTP client, creating it on first use."""
+        if cls._client is None:
+            # Ingestion workers may race here; only one of them builds the client
+            with cls._client_lock:
+                if cls._client is None:
+                    # HTTP/2 multiplexes concurrent requests over one connection;
+                    # responses are gzip/deflate-compressed (httpx's default
+                    # Accept-Encoding) and decoded transparently. Idle
+                    # connections are kept for 90 s so polling reuses them.
+                    transport = httpx.HTTPTransport(
+                        http2=True,
+                        retries=3,
+                        limits=httpx.Limits(
+                            max_keepalive_connections=20,
+                            max_connections=50,
+                            keepalive_expiry=90.0,
+                        ),
+                    )
+                    cls._client = httpx.Client(
+                        transport=transport,
+                        timeout=httpx.Timeout(30.0, connect=10.0),
+                    )
+                    atexit.register(cls._client.close)
+        return cls._client
 
     def list_messages(
         self,
@@ -157,6 +252,7 @@ class EmailService:
         filter_query: Optional[str] = None,
         order_by: str = "receivedDateTime desc",
         mailbox: Optional[str] = None,
+        include_body: bool = True,
     ) -> list[EmailMessage]:
         """
         List messages from a mail folder.
@@ -167,6 +263,7 @@ class EmailService:
             skip: Number of messages to skip
             filter_query: OData filter query
             order_by: OData orderby clause
+            include_body: If False, leave out the message body (body_content is empty)
 
         Returns:
             List of EmailMessage objects
@@ -181,15 +278,14 @@ class EmailService:
             "$top": top,
             "$skip": skip,
             "$orderby": order_by,
-            "$select": "id,subject,body,bodyPreview,from,receivedDateTime,webLink,internetMessageId,conversationId,hasAttachments",
+            "$select": MESSAGE_FIELDS if include_body else MESSAGE_METADATA_FIELDS,
         }
         if filter_query:
             params["$filter"] = filter_query
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers(), params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         messages = []
         for msg_data in data.get("value", []):
@@ -197,32 +293,106 @@ class EmailService:
 
         return messages
 
+    def iter_messages(
+        self,
+        folder: str = "Inbox",
+        page_size: int = 50,
+        mailbox: Optional[str] = None,
+        filter_query: Optional[str] = None,
+        order_by: str = "receivedDateTime desc",
+        include_body: bool = True,
+    ) -> Iterator[EmailMessage]:
+        """
+        Iterate over every message in a mail folder, page by page.
+
+        Follows Graph's @odata.nextLink cursor instead of growing $skip (which
+        Graph evaluates in O(skip)). The next page is fetched in the
+        background while the current one is being consumed.
+
+        Args:
+            folder: Mail folder name or path (e.g., 'Inbox/Assigned')
+            page_size: Messages per request
+            mailbox: Optional shared mailbox email address
+            filter_query: OData filter query. Put predicates here (e.g.
+                'isRead eq false', 'receivedDateTime ge ...') rather than
+                filtering client-side; Graph evaluates them in its index.
+            order_by: OData orderby clause
+            include_body: If False, leave out the message body (body_content is empty)
+        """
+        mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
+        folder_id = folder
+        if "/" in folder:
+            folder_id = self.get_folder_id(folder, mailbox)
+        url = f"{self._get_user_endpoint(mailbox)}/mailFolders/{folder_id}/messages"
+        params = {
+            "$top": page_size,
+            "$orderby": order_by,
+            "$select": MESSAGE_FIELDS if include_body else MESSAGE_METADATA_FIELDS,
+        }
+        if filter_query:
+            params["$filter"] = filter_query
+
+        client = self._get_client()
+
+        def fetch(page_url: str, page_params: Optional[dict] = None) -> dict:
+            response = client.get(page_url, auth=self._auth, params=page_params)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            data = fetch(url, params)
+            while True:
+                # nextLink already carries the query string
+                next_link = data.get("@odata.nextLink")
+                next_page = executor.submit(fetch, next_link) if next_link else None
+
+                for msg_data in data.get("value", []):
+                    yield EmailMessage.from_graph_response(msg_data)
+
+                if next_page is None:
+                    break
+                data = next_page.result()
+
     def get_message(self, message_id: str, mailbox: Optional[str] = None) -> EmailMessage:
         """Get a specific message by ID."""
         mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
         base_url = self._get_user_endpoint(mailbox)
         url = f"{base_url}/messages/{message_id}"
         params = {
-            "$select": "id,subject,body,bodyPreview,from,receivedDateTime,webLink,internetMessageId,conversationId,hasAttachments"
+            "$select": MESSAGE_FIELDS
         }
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers(), params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         return EmailMessage.from_graph_response(data)
 
-    def get_attachments(self, message_id: str, mailbox: Optional[str] = None) -> list[EmailAttachment]:
-        """Get attachments for a message."""
+    def get_attachments(
+        self,
+        message_id: str,
+        mailbox: Optional[str] = None,
+        include_content: bool = True,
+    ) -> list[EmailAttachment]:
+        """
+        Get attachments for a message.
+
+        Args:
+            message_id: ID of the message
+            mailbox: Optional shared mailbox email address
+            include_content: If False, only fetch metadata (use
+                save_attachment_streaming or stream_attachment for the content)
+        """
         mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
         base_url = self._get_user_endpoint(mailbox)
         url = f"{base_url}/messages/{message_id}/attachments"
+        params = {}
+        if not include_content:
+            params["$select"] = "id,name,contentType,size"
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         attachments = []
         for att_data in data.get("value", []):
@@ -244,6 +414,48 @@ class EmailService:
 
         return filepath
 
+    def save_attachment_streaming(
+        self,
+        message_id: str,
+        attachment_id: str,
+        directory: Path,
+        name: str,
+        mailbox: Optional[str] = None,
+        size: Optional[int] = None,
+    ) -> Path:
+        """
+        Download an attachment straight to disk.
+
+        The raw bytes come from the Graph $value endpoint in chunks, so the
+        file is never base64-encoded in transit or held in memory as a whole.
+        Chunks are written as they arrive from the network, without being
+        re-buffered into fixed-size pieces.
+
+        Args:
+            size: Expected size in bytes, if known; the file's blocks are
+                allocated up front (where supported) to limit fragmentation
+
+        Returns:
+            Path of the saved file (directory / name)
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        filepath = directory / name
+
+        with filepath.open("wb") as f:
+            if size and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, size)
+                except OSError:
+                    pass  # Filesystem without fallocate support
+            for chunk in self.stream_attachment(
+                message_id, attachment_id, mailbox=mailbox, chunk_size=None
+            ):
+                f.write(chunk)
+            # Drop any preallocated space past the actual content
+            f.truncate()
+
+        return filepath
+
     def send_reply(
         self,
         message_id: str,
@@ -263,9 +475,8 @@ class EmailService:
 
         payload = {"comment": reply_body}
 
-        with httpx.Client() as client:
-            response = client.post(url, headers=self._get_headers(), json=payload)
-            response.raise_for_status()
+        response = self._get_client().post(url, auth=self._auth, json=payload)
+        response.raise_for_status()
 
     def forward_message(
         self,
@@ -291,9 +502,8 @@ class EmailService:
         if comment:
             payload["comment"] = comment
 
-        with httpx.Client() as client:
-            response = client.post(url, headers=self._get_headers(), json=payload)
-            response.raise_for_status()
+        response = self._get_client().post(url, auth=self._auth, json=payload)
+        response.raise_for_status()
 
     def mark_as_read(
         self,
@@ -307,18 +517,17 @@ class EmailService:
         url = f"{base_url}/messages/{message_id}"
         payload = {"isRead": is_read}
 
-        with httpx.Client() as client:
-            response = client.patch(url, headers=self._get_headers(), json=payload)
-            response.raise_for_status()
+        response = self._get_client().patch(url, auth=self._auth, json=payload)
+        response.raise_for_status()
 
     def get_unread_count(self, folder: str = "Inbox") -> int:
         """Get count of unread messages in a folder."""
         url = f"{self.GRAPH_BASE_URL}/me/mailFolders/{folder}"
+        params = {"$select": "unreadItemCount"}
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         return data.get("unreadItemCount", 0)
 
@@ -343,34 +552,46 @@ class EmailService:
         Returns:
             The folder ID
         """
+        key = (mailbox, folder_path)
+        if key in self._folder_id_cache:
+            return self._folder_id_cache[key]
+
         base_url = self._get_user_endpoint(mailbox)
         parts = folder_path.split("/")
 
         # Start with the root folder
         current_folder_id = parts[0]
 
-        with httpx.Client() as client:
-            # If there are subfolders, navigate to them
-            for subfolder_name in parts[1:]:
-                # Get child folders of current folder
-                url = f"{base_url}/mailFolders/{current_folder_id}/childFolders"
-                response = client.get(url, headers=self._get_headers())
-                response.raise_for_status()
-                data = response.json()
-
-                # Find the subfolder by name
-                found = False
-                for folder in data.get("value", []):
-                    if folder.get("displayName", "").lower() == subfolder_name.lower():
-                        current_folder_id = folder["id"]
-                        found = True
-                        break
-
-                if not found:
-                    raise ValueError(f"Folder not found: {subfolder_name} in {folder_path}")
+        client = self._get_client()
+
+        # If there are subfolders, navigate to them. Each level needs its
+        # parent's ID, so levels are resolved one request at a time; the
+        # name match runs server-side (displayName comparisons are
+        # case-insensitive) so only the matching folder comes back, and a
+        # parent with more children than one page still resolves.
+        for subfolder_name in parts[1:]:
+            url = f"{base_url}/mailFolders/{current_folder_id}/childFolders"
+            escaped_name = subfolder_name.replace("'", "''")
+            params = {
+                "$filter": f"displayName eq '{escaped_name}'",
+                "$select": "id",
+                "$top": 1,
+            }
+            response = client.get(url, auth=self._auth, params=params)
+            response.raise_for_status()
+            folders = orjson.loads(response.content).get("value", [])
+
+            if not folders:
+                raise ValueError(f"Folder not found: {subfolder_name} in {folder_path}")
+            current_folder_id = folders[0]["id"]
 
+        self._folder_id_cache[key] = current_folder_id
         return current_folder_id
 
+    def invalidate_folder_cache(self) -> None:
+        """Forget resolved folder IDs (e.g. after folders are renamed or moved)."""
+        self._folder_id_cache.clear()
+
     def list_messages_from_shared_mailbox(
         self,
         mailbox: str,
@@ -379,6 +600,7 @@ class EmailService:
         skip: int = 0,
         filter_query: Optional[str] = None,
         order_by: str = "receivedDateTime desc",
+        include_body: bool = True,
     ) -> list[EmailMessage]:
         """
         List messages from a shared mailbox folder.
@@ -390,6 +612,7 @@ class EmailService:
             skip: Number of messages to skip
             filter_query: OData filter query
             order_by: OData orderby clause
+            include_body: If False, leave out the message body (body_content is empty)
 
         Returns:
             List of EmailMessage objects
@@ -402,15 +625,14 @@ class EmailService:
             "$top": top,
             "$skip": skip,
             "$orderby": order_by,
-            "$select": "id,subject,body,bodyPreview,from,receivedDateTime,webLink,internetMessageId,conversationId,hasAttachments",
+            "$select": MESSAGE_FIELDS if include_body else MESSAGE_METADATA_FIELDS,
         }
         if filter_query:
             params["$filter"] = filter_query
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers(), params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         messages = []
         for msg_data in data.get("value", []):
@@ -442,13 +664,12 @@ class EmailService:
         params = {
             "$filter": f"conversationId eq '{conversation_id}'",
             "$orderby": "receivedDateTime asc",
-            "$select": "id,subject,body,bodyPreview,from,receivedDateTime,webLink,internetMessageId,conversationId,hasAttachments",
+            "$select": MESSAGE_FIELDS,
         }
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers(), params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         messages = []
         for msg_data in data.get("value", []):
@@ -456,11 +677,133 @@ class EmailService:
 
         return messages
 
+    def get_conversation_messages_bulk(
+        self,
+        conversation_ids: list[str],
+        mailbox: Optional[str] = None,
+        folder_path: str = "Inbox",
+    ) -> dict[str, list[EmailMessage]]:
+        """
+        Get the messages of several conversation threads, batched.
+
+        Same results as calling get_conversation_messages per conversation,
+        but the lookups go out as Graph JSON batches (up to BATCH_LIMIT
+        conversations per HTTP request).
+
+        Returns:
+            Messages per conversation ID, each ordered by date (oldest first)
+        """
+        base_path = self._get_user_endpoint(mailbox)[len(self.GRAPH_BASE_URL):]
+        folder_id = self.get_folder_id(folder_path, mailbox)
+
+        requests = []
+        for conversation_id in conversation_ids:
+            params = {
+                "$filter": f"conversationId eq '{conversation_id}'",
+                "$orderby": "receivedDateTime asc",
+                "$select": MESSAGE_FIELDS,
+            }
+            requests.append(
+                {
+                    "method": "GET",
+                    "url": f"{base_path}/mailFolders/{folder_id}/messages?{urlencode(params)}",
+                }
+            )
+
+        return {
+            conversation_id: [
+                EmailMessage.from_graph_response(msg_data) for msg_data in body.get("value", [])
+            ]
+            for conversation_id, body in zip(conversation_ids, self._graph_batch(requests))
+        }
+
+    def get_messages_bulk(
+        self,
+        message_ids: list[str],
+        mailbox: Optional[str] = None,
+    ) -> list[EmailMessage]:
+        """
+        Get several messages by ID, batched (up to BATCH_LIMIT per HTTP request).
+
+        Returns:
+            Messages in the order of `message_ids`
+        """
+        mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
+        base_path = self._get_user_endpoint(mailbox)[len(self.GRAPH_BASE_URL):]
+        query = urlencode({"$select": MESSAGE_FIELDS})
+
+        bodies = self._graph_batch(
+            [
+                {"method": "GET", "url": f"{base_path}/messages/{message_id}?{query}"}
+                for message_id in message_ids
+            ]
+        )
+        return [EmailMessage.from_graph_response(body) for body in bodies]
+
+    def mark_many_as_read(
+        self,
+        message_ids: list[str],
+        is_read: bool = True,
+        mailbox: Optional[str] = None,
+    ) -> None:
+        """Mark several messages as read or unread, batched (up to BATCH_LIMIT per HTTP request)."""
+        mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
+        base_path = self._get_user_endpoint(mailbox)[len(self.GRAPH_BASE_URL):]
+
+        self._graph_batch(
+            [
+                {
+                    "method": "PATCH",
+                    "url": f"{base_path}/messages/{message_id}",
+                    "body": {"isRead": is_read},
+                    "headers": {"Content-Type": "application/json"},
+                }
+                for message_id in message_ids
+            ]
+        )
+
+    def _graph_batch(self, requests: list[dict]) -> list[dict]:
+        """
+        Send several Graph requests through the $batch endpoint.
+
+        Args:
+            requests: Sub-requests with "method" and "url" (relative to
+                GRAPH_BASE_URL, with query string), plus "body" and "headers"
+                when needed
+
+        Returns:
+            Response bodies ({} when there is none), in the order of `requests`
+        """
+        client = self._get_client()
+        bodies: list[dict] = [{} for _ in requests]
+
+        for start in range(0, len(requests), self.BATCH_LIMIT):
+            batch = [
+                {"id": str(index), **request}
+                for index, request in enumerate(requests[start : start + self.BATCH_LIMIT], start)
+            ]
+            response = client.post(
+                f"{self.GRAPH_BASE_URL}/$batch", auth=self._auth, json={"requests": batch}
+            )
+            response.raise_for_status()
+
+            for result in orjson.loads(response.content).get("responses", []):
+                body = result.get("body") or {}
+                if result.get("status", 500) >= 400:
+                    message = body.get("error", {}).get("message", "unknown error")
+                    raise ValueError(
+                        f"Graph batch request failed ({result.get('status')}): {message}"
+                    )
+                bodies[int(result["id"])] = body
+
+        return bodies
+
     def get_first_message_in_chain(
         self,
         message: EmailMessage,
         mailbox: Optional[str] = None,
         folder_path: str = "Inbox",
+        include_body: bool = True,
     ) -> EmailMessage:
         """
         Get the first (oldest) message in an email chain.
@@ -469,21 +812,43 @@ class EmailService:
             message: Any message in the conversation
             mailbox: Optional shared mailbox email address
             folder_path: Mail folder path to search in
+            include_body: If False, leave out the message body (body_content is empty)
 
         Returns:
             The first EmailMessage in the conversation thread
         """
-        messages = self.get_conversation_messages(
+        first = self._get_first_message(
             message.conversation_id,
             mailbox=mailbox,
             folder_path=folder_path,
+            include_body=include_body,
         )
+        return first or message
+
+    def _get_first_message(
+        self,
+        conversation_id: str,
+        mailbox: Optional[str] = None,
+        folder_path: str = "Inbox",
+        include_body: bool = True,
+    ) -> Optional[EmailMessage]:
+        """Get only the oldest message of a conversation (None if none is in the folder)."""
+        base_url = self._get_user_endpoint(mailbox)
+        folder_id = self.get_folder_id(folder_path, mailbox)
+
+        url = f"{base_url}/mailFolders/{folder_id}/messages"
+        params = {
+            "$filter": f"conversationId eq '{conversation_id}'",
+            "$orderby": "receivedDateTime asc",
+            "$top": 1,
+            "$select": MESSAGE_FIELDS if include_body else MESSAGE_METADATA_FIELDS,
+        }
 
-        if not messages:
-            return message
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        values = orjson.loads(response.content).get("value", [])
 
-        # Return the oldest message (first in the list since ordered by date asc)
-        return messages[0]
+        return EmailMessage.from_graph_response(values[0]) if values else None
 
     def get_message_from_shared_mailbox(
         self,
@@ -494,13 +859,12 @@ class EmailService:
         base_url = self._get_user_endpoint(mailbox)
         url = f"{base_url}/messages/{message_id}"
         params = {
-            "$select": "id,subject,body,bodyPreview,from,receivedDateTime,webLink,internetMessageId,conversationId,hasAttachments"
+            "$select": MESSAGE_FIELDS
         }
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers(), params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         return EmailMessage.from_graph_response(data)
 
@@ -508,15 +872,26 @@ class EmailService:
         self,
         message_id: str,
         mailbox: str,
+        include_content: bool = True,
     ) -> list[EmailAttachment]:
-        """Get attachments for a message from a shared mailbox."""
+        """
+        Get attachments for a message from a shared mailbox.
+
+        Args:
+            message_id: ID of the message
+            mailbox: Shared mailbox email address
+            include_content: If False, only fetch metadata (use stream_attachment
+                to download the content)
+        """
         base_url = self._get_user_endpoint(mailbox)
         url = f"{base_url}/messages/{message_id}/attachments"
+        params = {}
+        if not include_content:
+            params["$select"] = "id,name,contentType,size"
 
-        with httpx.Client() as client:
-            response = client.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         attachments = []
         for att_data in data.get("value", []):
@@ -525,10 +900,214 @@ class EmailService:
 
         return attachments
 
+    def stream_attachment(
+        self,
+        message_id: str,
+        attachment_id: str,
+        mailbox: Optional[str] = None,
+        chunk_size: Optional[int] = 64 * 1024,
+    ) -> Iterator[bytes]:
+        """
+        Stream the raw bytes of an attachment via the Graph $value endpoint.
+
+        Unlike get_attachments, the content is never base64-decoded or held
+        in memory as a whole. chunk_size=None yields chunks as received.
+        """
+        mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
+        base_url = self._get_user_endpoint(mailbox)
+        url = f"{base_url}/messages/{message_id}/attachments/{attachment_id}/$value"
+
+        with self._get_client().stream("GET", url, auth=self._auth) as response:
+            response.raise_for_status()
+            yield from response.iter_bytes(chunk_size)
+
+
+class AsyncEmailService:
+    """
+    Async Graph client for fanning out many independent read requests.
+
+    Callers overlap requests with asyncio.gather, e.g.
+    ``await asyncio.gather(*[svc.get_message(i) for i in ids])``; at most
+    MAX_CONCURRENCY requests are in flight at once to stay under Graph
+    throttling. Tokens come from a wrapped EmailService, so both share the
+    same credentials, refresh logic and folder ID cache. Close with aclose()
+    (or use as an async context manager).
+    """
+
+    MAX_CONCURRENCY = 10
+
+    def __init__(self, email_service: Optional[EmailService] = None):
+        self._service = email_service or EmailService()
+        self.settings = self._service.settings
+        self._auth = _GraphAuth(self._service)
+        self._client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=self.MAX_CONCURRENCY),
+            ),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+    async def __aenter__(self) -> "AsyncEmailService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
+
+    async def _get_json(self, url: str, params: Optional[dict] = None) -> dict:
+        """GET a Graph URL and return the decoded JSON body."""
+        async with self._semaphore:
+            response = await self._client.get(url, auth=self._auth, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def get_folder_id(self, folder_path: str, mailbox: Optional[str] = None) -> str:
+        """Get the folder ID for a nested folder path like 'Inbox/Assigned'."""
+        key = (mailbox, folder_path)
+        if key in self._service._folder_id_cache:
+            return self._service._folder_id_cache[key]
+
+        base_url = self._service._get_user_endpoint(mailbox)
+        parts = folder_path.split("/")
+        current_folder_id = parts[0]
+
+        # Each level needs its parent's ID, so levels resolve in sequence;
+        # concurrency comes from resolving different paths/mailboxes at once
+        for subfolder_name in parts[1:]:
+            escaped_name = subfolder_name.replace("'", "''")
+            data = await self._get_json(
+                f"{base_url}/mailFolders/{current_folder_id}/childFolders",
+                params={
+                    "$filter": f"displayName eq '{escaped_name}'",
+                    "$select": "id",
+                    "$top": 1,
+                },
+            )
+            folders = data.get("value", [])
+            if not folders:
+                raise ValueError(f"Folder not found: {subfolder_name} in {folder_path}")
+            current_folder_id = folders[0]["id"]
+
+        self._service._folder_id_cache[key] = current_folder_id
+        return current_folder_id
+
+    async def get_message(self, message_id: str, mailbox: Optional[str] = None) -> EmailMessage:
+        """Get a specific message by ID."""
+        mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
+        base_url = self._service._get_user_endpoint(mailbox)
+        data = await self._get_json(
+            f"{base_url}/messages/{message_id}", params={"$select": MESSAGE_FIELDS}
+        )
+        return EmailMessage.from_graph_response(data)
+
+    async def get_attachments(
+        self,
+        message_id: str,
+        mailbox: Optional[str] = None,
+        include_content: bool = True,
+    ) -> list[EmailAttachment]:
+        """Get the file attachments of a message."""
+        mailbox = mailbox or self.settings.shared_mailbox or self.settings.graph_mailbox
+        base_url = self._service._get_user_endpoint(mailbox)
+        params = {}
+        if not include_content:
+            params["$select"] = "id,name,contentType,size"
+
+        data = await self._get_json(f"{base_url}/messages/{message_id}/attachments", params=params)
+        return [
+            EmailAttachment.from_graph_response(att_data)
+            for att_data in data.get("value", [])
+            if att_data.get("@odata.type") == "#microsoft.graph.fileAttachment"
+        ]
+
+    async def get_conversation_messages(
+        self,
+        conversation_id: str,
+        mailbox: Optional[str] = None,
+        folder_path: str = "Inbox",
+    ) -> list[EmailMessage]:
+        """Get all messages in a conversation thread, oldest first."""
+        base_url = self._service._get_user_endpoint(mailbox)
+        folder_id = await self.get_folder_id(folder_path, mailbox)
+        data = await self._get_json(
+            f"{base_url}/mailFolders/{folder_id}/messages",
+            params={
+                "$filter": f"conversationId eq '{conversation_id}'",
+                "$orderby": "receivedDateTime asc",
+                "$select": MESSAGE_FIELDS,
+            },
+        )
+        return [EmailMessage.from_graph_response(msg_data) for msg_data in data.get("value", [])]
+
+    async def list_messages_from_shared_mailbox(
+        self,
+        mailbox: str,
+        folder_path: str = "Inbox",
+        top: int = 50,
+        skip: int = 0,
+        filter_query: Optional[str] = None,
+        order_by: str = "receivedDateTime desc",
+        include_body: bool = True,
+    ) -> list[EmailMessage]:
+        """List messages from a shared mailbox folder."""
+        base_url = self._service._get_user_endpoint(mailbox)
+        folder_id = await self.get_folder_id(folder_path, mailbox)
+        params = {
+            "$top": top,
+            "$skip": skip,
+            "$orderby": order_by,
+            "$select": MESSAGE_FIELDS if include_body else MESSAGE_METADATA_FIELDS,
+        }
+        if filter_query:
+            params["$filter"] = filter_query
+
+        data = await self._get_json(f"{base_url}/mailFolders/{folder_id}/messages", params=params)
+        return [EmailMessage.from_graph_response(msg_data) for msg_data in data.get("value", [])]
+
+    async def list_messages_bulk(
+        self,
+        mailboxes: list[str],
+        folder_path: str = "Inbox",
+        **kwargs,
+    ) -> dict[str, list[EmailMessage]]:
+        """
+        List messages from several shared mailboxes concurrently.
+
+        Args:
+            mailboxes: Shared mailbox email addresses
+            folder_path: Mail folder path, resolved in each mailbox
+            **kwargs: Passed on to list_messages_from_shared_mailbox
+
+        Returns:
+            Messages per mailbox
+        """
+        results = await asyncio.gather(
+            *[
+                self.list_messages_from_shared_mailbox(mailbox, folder_path, **kwargs)
+                for mailbox in mailboxes
+            ]
+        )
+        return dict(zip(mailboxes, results))
+
 
 class EmailTemplateService:
     """Service for managing email reply templates."""
 
+    # Context values templates may leave out
+    DEFAULT_CONTEXT = {
+        "adjuster_name": "",
+        "claimant_name": "",
+        "claim_number": "",
+        "original_subject": "",
+        "signature": "",
+    }
+
     DEFAULT_TEMPLATES = {
         "missing_auth": {
             "label": "Missing Authorization",
@@ -596,6 +1175,19 @@ Best regards,
         },
     }
 
+    # Placeholder names per template, parsed once
+    _FIELDS: ClassVar[dict[str, tuple[str, ...]]] = {
+        name: tuple(
+            dict.fromkeys(
+                field
+                for text in (template["subject"], template["body"])
+                for _, field, _, _ in string.Formatter().parse(text)
+                if field
+            )
+        )
+        for name, template in DEFAULT_TEMPLATES.items()
+    }
+
     def get_template(self, template_name: str) -> Optional[dict]:
         """Get a template by name."""
         return self.DEFAULT_TEMPLATES.get(template_name)
@@ -617,14 +1209,17 @@ Best regards,
         if not template:
             raise ValueError(f"Template not found: {template_name}")
 
-        # Provide defaults for missing context
-        context.setdefault("adjuster_name", "")
-        context.setdefault("claimant_name", "")
-        context.setdefault("claim_number", "")
-        context.setdefault("original_subject", "")
-        context.setdefault("signature", "")
+        # Only the template's own placeholders, with defaults for missing context
+        values = {}
+        for field in self._FIELDS[template_name]:
+            if field in context:
+                values[field] = context[field]
+            elif field in self.DEFAULT_CONTEXT:
+                values[field] = self.DEFAULT_CONTEXT[field]
+            else:
+                raise KeyError(field)
 
         return {
-            "subject": template["subject"].format(**context),
-            "body": template["body"].format(**context),
+            "subject": template["subject"].format_map(values),
+            "body": template["body"].format_map(values),
         }
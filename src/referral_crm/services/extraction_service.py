@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
 
-from referral_crm.config import get_settings
+from referral_crm.config import get_integrations_settings
 
 # Lazy import to avoid startup issues if anthropic not installed
 anthropic = None
@@ -22,7 +22,7 @@ def get_anthropic_client():
         import anthropic as _anthropic
 
         anthropic = _anthropic
-    settings = get_settings()
+    settings = get_integrations_settings()
     if not settings.anthropic_api_key:
         raise ValueError("ANTHROPIC_API_KEY not configured")
     return anthropic.Anthropic(api_key=settings.anthropic_api_key)
@@ -414,7 +414,7 @@ class ExtractionService:
     """Service for extracting structured data from referral emails."""
 
     def __init__(self):
-        self.settings = get_settings()
+        self.settings = get_integrations_settings()
 
     def extract_from_email(
         self,
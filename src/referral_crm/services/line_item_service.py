@@ -11,6 +11,7 @@ import logging
 import re
 from typing import Optional
 
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
 from referral_crm.models import (
@@ -18,6 +19,7 @@ from referral_crm.models import (
     DimICD10,
     DimProcedureCode,
     DimServiceType,
+    Referral,
     ReferralLineItem,
     ServiceModality,
 )
@@ -176,6 +178,28 @@ class ServiceLineItemParser:
 
     def __init__(self, session: Session):
         self.session = session
+        # Per-session lookups: ICD-10 code -> (id, description) and
+        # (modality, contrast) -> (code, id, description)
+        self._icd10_cache: dict[str, Optional[tuple[int, Optional[str]]]] = {}
+        self._procedure_cache: dict[tuple, Optional[tuple[str, int, Optional[str]]]] = {}
+        # Per-session dimension name -> id maps, each loaded with one query on
+        # first use (so tables seeded later, or by another process, are seen)
+        self._service_type_ids: Optional[dict[str, int]] = None
+        self._body_region_ids: Optional[dict[str, int]] = None
+
+    def _service_type_id(self, name: str) -> Optional[int]:
+        if self._service_type_ids is None:
+            self._service_type_ids = dict(
+                self.session.query(DimServiceType.name, DimServiceType.id).all()
+            )
+        return self._service_type_ids.get(name)
+
+    def _body_region_id(self, name: str) -> Optional[int]:
+        if self._body_region_ids is None:
+            self._body_region_ids = dict(
+                self.session.query(DimBodyRegion.name, DimBodyRegion.id).all()
+            )
+        return self._body_region_ids.get(name)
 
     def parse(
         self,
@@ -282,14 +306,7 @@ class ServiceLineItemParser:
             for keyword in config["keywords"]:
                 if keyword in text_lower:
                     item.modality = config["modality"]
-                    # Try to find in dimension table
-                    service_type = (
-                        self.session.query(DimServiceType)
-                        .filter(DimServiceType.name == service_name)
-                        .first()
-                    )
-                    if service_type:
-                        item.service_type_id = service_type.id
+                    item.service_type_id = self._service_type_id(service_name)
                     break
             if item.modality:
                 break
@@ -298,14 +315,7 @@ class ServiceLineItemParser:
         for region_key, config in self.BODY_REGION_PATTERNS.items():
             for keyword in config["keywords"]:
                 if keyword in text_lower:
-                    # Try to find in dimension table
-                    body_region = (
-                        self.session.query(DimBodyRegion)
-                        .filter(DimBodyRegion.name == config["name"])
-                        .first()
-                    )
-                    if body_region:
-                        item.body_region_id = body_region.id
+                    item.body_region_id = self._body_region_id(config["name"])
                     break
             if item.body_region_id:
                 break
@@ -342,25 +352,41 @@ class ServiceLineItemParser:
         if not item.icd10_code:
             return
 
-        icd10 = (
-            self.session.query(DimICD10)
-            .filter(DimICD10.code == item.icd10_code.upper())
-            .first()
-        )
+        code = item.icd10_code.upper()
+        if code not in self._icd10_cache:
+            self._icd10_cache[code] = (
+                self.session.query(DimICD10.id, DimICD10.description)
+                .filter(DimICD10.code == code)
+                .first()
+            )
+        icd10 = self._icd10_cache[code]
         if icd10:
-            item.icd10_id = icd10.id
+            item.icd10_id, description = icd10
             if not item.icd10_description:
-                item.icd10_description = icd10.description
+                item.icd10_description = description
 
     def _derive_procedure_code(self, item: ReferralLineItem) -> None:
         """Attempt to derive CPT procedure code from service details."""
         if not item.modality:
             return
 
+        is_imaging = item.modality == ServiceModality.IMAGING
+        key = (item.modality, item.with_contrast if is_imaging else None)
+        if key not in self._procedure_cache:
+            self._procedure_cache[key] = self._find_procedure_code(item)
+
+        procedure = self._procedure_cache[key]
+        if procedure:
+            item.procedure_code, item.procedure_code_id, item.procedure_description = procedure
+
+    def _find_procedure_code(
+        self, item: ReferralLineItem
+    ) -> Optional[tuple[str, int, Optional[str]]]:
+        """Look up the first active CPT code matching a line item's modality (and contrast)."""
         # Build query based on what we know
-        query = self.session.query(DimProcedureCode).filter(
-            DimProcedureCode.is_active == True
-        )
+        query = self.session.query(
+            DimProcedureCode.code, DimProcedureCode.id, DimProcedureCode.description
+        ).filter(DimProcedureCode.is_active == True)
 
         # Filter by modality/service type
         modality_service_map = {
@@ -379,11 +405,7 @@ class ServiceLineItemParser:
             query = query.filter(DimProcedureCode.with_contrast == item.with_contrast)
 
         # Get first matching code
-        procedure = query.first()
-        if procedure:
-            item.procedure_code = procedure.code
-            item.procedure_code_id = procedure.id
-            item.procedure_description = procedure.description
+        return query.first()
 
 
 class LineItemService:
@@ -426,18 +448,12 @@ class LineItemService:
         **kwargs,
     ) -> ReferralLineItem:
         """Manually add a line item to a referral."""
-        # Get the next line number
-        from referral_crm.models import Referral
-
-        referral = self.session.query(Referral).get(referral_id)
-        if not referral:
+        if self.session.get(Referral, referral_id) is None:
             raise ValueError(f"Referral {referral_id} not found")
 
-        max_line = max([li.line_number for li in referral.line_items], default=0)
-
         item = ReferralLineItem(
             referral_id=referral_id,
-            line_number=max_line + 1,
+            line_number=self._next_line_number(referral_id),
             service_description=service_description,
             source="manual",
             **kwargs,
@@ -461,17 +477,12 @@ class LineItemService:
         user: str = "api",
     ) -> ReferralLineItem:
         """Create a new line item for a referral."""
-        from referral_crm.models import Referral
-
-        referral = self.session.query(Referral).get(referral_id)
-        if not referral:
+        if self.session.get(Referral, referral_id) is None:
             raise ValueError(f"Referral {referral_id} not found")
 
-        max_line = max([li.line_number for li in referral.line_items], default=0)
-
         item = ReferralLineItem(
             referral_id=referral_id,
-            line_number=max_line + 1,
+            line_number=self._next_line_number(referral_id),
             service_description=service_description,
             icd10_code=icd10_code,
             icd10_description=icd10_description,
@@ -487,6 +498,45 @@ class LineItemService:
         logger.info(f"Line item created for referral {referral_id} by {user}")
         return item
 
+    def bulk_create(self, referral_id: int, items: list[dict]) -> list[int]:
+        """
+        Add several line items to a referral in one INSERT ... RETURNING.
+
+        Items are numbered after the referral's existing line items.
+
+        Args:
+            referral_id: The referral the line items belong to
+            items: Line item column values (service_description, icd10_code, ...)
+
+        Returns:
+            IDs of the new line items, in the order given
+        """
+        if not items:
+            return []
+
+        first_line = self._next_line_number(referral_id)
+        rows = [
+            {**item, "referral_id": referral_id, "line_number": first_line + i}
+            for i, item in enumerate(items)
+        ]
+        ids = self.session.scalars(
+            insert(ReferralLineItem).returning(
+                ReferralLineItem.id, sort_by_parameter_order=True
+            ),
+            rows,
+        ).all()
+        self.session.commit()
+        return list(ids)
+
+    def _next_line_number(self, referral_id: int) -> int:
+        """Next free line number for a referral, computed in SQL."""
+        max_line = (
+            self.session.query(func.max(ReferralLineItem.line_number))
+            .filter(ReferralLineItem.referral_id == referral_id)
+            .scalar()
+        )
+        return (max_line or 0) + 1
+
     def update(self, line_item_id: int, user: str = "api", **updates) -> Optional[ReferralLineItem]:
         """Update an existing line item."""
         item = self.session.query(ReferralLineItem).get(line_item_id)
@@ -12,12 +12,13 @@ import csv
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import ClassVar, List, Optional
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import column, func, inspect, select, table
+from sqlalchemy.orm import Query, Session
 
 from referral_crm.models import DimICD10 as ICD10Code, DimProcedureCode as ProcedureCode
+from referral_crm.models import bulk_upsert
 
 
 @dataclass
@@ -48,9 +49,36 @@ class ReferenceDataService:
     Uses the SQLite database for ICD-10 and procedure code lookups.
     """
 
+    # Whether each description search index (see models/dimensions.py) exists
+    _search_index_exists: ClassVar[dict[str, bool]] = {}
+
     def __init__(self, session: Session):
         self.session = session
 
+    def _filter_by_description(self, query: Query, model, terms: list[str]) -> Query:
+        """
+        Filter a query to rows whose description contains every term.
+
+        Uses the table's FTS5 trigram index when the database has one, otherwise
+        falls back to a case-insensitive substring scan.
+        """
+        index_name = f"{model.__tablename__}_fts"
+        if index_name not in self._search_index_exists:
+            self._search_index_exists[index_name] = inspect(
+                self.session.get_bind()
+            ).has_table(index_name)
+
+        if self._search_index_exists[index_name]:
+            index = table(index_name, column("rowid"), column("description"))
+            matches = select(index.c.rowid)
+            for term in terms:
+                matches = matches.where(index.c.description.like(f"%{term}%"))
+            return query.filter(model.id.in_(matches))
+
+        for term in terms:
+            query = query.filter(func.lower(model.description).contains(term))
+        return query
+
     # =========================================================================
     # ICD-10 LOOKUPS
     # =========================================================================
@@ -142,11 +170,7 @@ class ReferenceDataService:
         # Split keywords and search for any match
         terms = keywords.lower().split()
         query = self.session.query(ICD10Code).filter(ICD10Code.is_active == True)
-
-        for term in terms:
-            query = query.filter(
-                func.lower(ICD10Code.description).contains(term)
-            )
+        query = self._filter_by_description(query, ICD10Code, terms)
 
         return query.limit(limit).all()
 
@@ -262,11 +286,7 @@ class ReferenceDataService:
 
         terms = keywords.lower().split()
         query = self.session.query(ProcedureCode).filter(ProcedureCode.is_active == True)
-
-        for term in terms:
-            query = query.filter(
-                func.lower(ProcedureCode.description).contains(term)
-            )
+        query = self._filter_by_description(query, ProcedureCode, terms)
 
         return query.limit(limit).all()
 
@@ -286,7 +306,7 @@ class ReferenceDataService:
         Returns:
             Number of codes loaded
         """
-        count = 0
+        rows = []
         with open(csv_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -294,28 +314,16 @@ class ReferenceDataService:
                 if not code:
                     continue
 
-                # Check if already exists
-                existing = self.session.query(ICD10Code).filter(
-                    func.upper(ICD10Code.code) == code.upper()
-                ).first()
-
-                if existing:
-                    # Update existing
-                    existing.description = row.get('description', '').strip()
-                    existing.category = row.get('category', '').strip() or None
-                    existing.body_region = row.get('body_region', '').strip() or None
-                    existing.is_active = True
-                else:
-                    # Create new
-                    icd10 = ICD10Code(
-                        code=code,
-                        description=row.get('description', '').strip(),
-                        category=row.get('category', '').strip() or None,
-                        body_region=row.get('body_region', '').strip() or None,
-                    )
-                    self.session.add(icd10)
-                count += 1
+                rows.append({
+                    "code": code,
+                    "description": row.get('description', '').strip(),
+                    "category": row.get('category', '').strip() or None,
+                    "body_region": row.get('body_region', '').strip() or None,
+                    "is_active": True,
+                })
 
+        # Insert new codes and update existing ones in one statement
+        count = bulk_upsert(self.session, ICD10Code, rows, index_elements=["code"])
         self.session.commit()
         return count
 
@@ -331,7 +339,7 @@ class ReferenceDataService:
         Returns:
             Number of codes loaded
         """
-        count = 0
+        rows = []
         with open(csv_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -339,30 +347,17 @@ class ReferenceDataService:
                 if not code:
                     continue
 
-                # Check if already exists
-                existing = self.session.query(ProcedureCode).filter(
-                    func.upper(ProcedureCode.code) == code.upper()
-                ).first()
-
-                if existing:
-                    # Update existing
-                    existing.description = row.get('description', '').strip()
-                    existing.service_type = row.get('service_type', '').strip() or None
-                    existing.modality = row.get('modality', '').strip() or None
-                    existing.body_region = row.get('body_region', '').strip() or None
-                    existing.is_active = True
-                else:
-                    # Create new
-                    proc = ProcedureCode(
-                        code=code,
-                        description=row.get('description', '').strip(),
-                        service_type=row.get('service_type', '').strip() or None,
-                        modality=row.get('modality', '').strip() or None,
-                        body_region=row.get('body_region', '').strip() or None,
-                    )
-                    self.session.add(proc)
-                count += 1
-
+                rows.append({
+                    "code": code,
+                    "description": row.get('description', '').strip(),
+                    "service_type": row.get('service_type', '').strip() or None,
+                    "modality": row.get('modality', '').strip() or None,
+                    "body_region": row.get('body_region', '').strip() or None,
+                    "is_active": True,
+                })
+
+        # Insert new codes and update existing ones in one statement
+        count = bulk_upsert(self.session, ProcedureCode, rows, index_elements=["code"])
         self.session.commit()
         return count
 
@@ -10,9 +10,10 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import func, or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer
 
 from referral_crm.models import (
+    Attachment,
     AuditLog,
     Carrier,
     Email,
@@ -20,7 +21,16 @@ from referral_crm.models import (
     ReferralLineItem,
     ReferralStatus,
     Priority,
+    copy_insert,
 )
+from referral_crm.models.referral import NOTES_MAX_LENGTH
+
+# Milestone timestamp stamped when a referral enters each status
+STATUS_TIMESTAMP_FIELDS = {
+    ReferralStatus.COMPLETED: "completed_at",
+    ReferralStatus.VALIDATED: "validated_at",
+    ReferralStatus.SCHEDULED: "scheduled_at",
+}
 
 
 class ReferralService:
@@ -54,7 +64,7 @@ class ReferralService:
             .options(
                 joinedload(Referral.carrier),
                 joinedload(Referral.source_email),
-                joinedload(Referral.line_items),
+                selectinload(Referral.line_items),
             )
             .filter(Referral.id == referral_id)
             .first()
@@ -81,10 +91,14 @@ class ReferralService:
         order_desc: bool = True,
     ) -> list[Referral]:
         """List referrals with optional filtering."""
+        # Everything a worklist row shows comes back in two queries (referral
+        # joined to carrier, email and RX attachment, then the line items);
+        # rows only show the carrier's name
         query = self.session.query(Referral).options(
-            joinedload(Referral.carrier),
+            joinedload(Referral.carrier).load_only(Carrier.name),
             joinedload(Referral.source_email),
-            joinedload(Referral.line_items),
+            joinedload(Referral.rx_attachment),
+            selectinload(Referral.line_items),
         )
 
         if status:
@@ -97,8 +111,7 @@ class ReferralService:
             search_term = f"%{search}%"
             query = query.filter(
                 or_(
-                    Referral.patient_first_name.ilike(search_term),
-                    Referral.patient_last_name.ilike(search_term),
+                    Referral.patient_full_name.ilike(search_term),
                     Referral.claim_number.ilike(search_term),
                     Referral.adjuster_name.ilike(search_term),
                     Referral.service_summary.ilike(search_term),
@@ -160,15 +173,13 @@ class ReferralService:
             return None
 
         old_status = referral.status
+        now = datetime.utcnow()
         referral.status = new_status
-        referral.updated_at = datetime.utcnow()
+        referral.updated_at = now
 
-        if new_status == ReferralStatus.COMPLETED:
-            referral.completed_at = datetime.utcnow()
-        elif new_status == ReferralStatus.VALIDATED:
-            referral.validated_at = datetime.utcnow()
-        elif new_status == ReferralStatus.SCHEDULED:
-            referral.scheduled_at = datetime.utcnow()
+        timestamp_field = STATUS_TIMESTAMP_FIELDS.get(new_status)
+        if timestamp_field:
+            setattr(referral, timestamp_field, now)
 
         self._log_action(
             referral_id,
@@ -184,6 +195,57 @@ class ReferralService:
         self.session.refresh(referral)
         return referral
 
+    def update_status_many(
+        self,
+        referrals: list[Referral],
+        new_status: ReferralStatus,
+        user: str = "system",
+        notes: Optional[str] = None,
+    ) -> int:
+        """
+        Update the status of several referrals in one commit.
+
+        The audit entries are appended with one bulk write (COPY on
+        PostgreSQL) instead of one INSERT per referral.
+
+        Args:
+            referrals: Referrals to update (attached to this session)
+            new_status: Status to set
+            user: Who made the change
+            notes: Note recorded on every audit entry
+
+        Returns:
+            Number of referrals updated
+        """
+        if not referrals:
+            return 0
+
+        now = datetime.utcnow()
+        timestamp_field = STATUS_TIMESTAMP_FIELDS.get(new_status)
+        notes = notes[:NOTES_MAX_LENGTH] if notes else notes
+        audit_rows = []
+        for referral in referrals:
+            audit_rows.append(
+                {
+                    "referral_id": referral.id,
+                    "action": "status_changed",
+                    "changes": AuditLog.field_change(
+                        "status", referral.status.value, new_status.value
+                    ),
+                    "user": user,
+                    "notes": notes,
+                }
+            )
+            referral.status = new_status
+            referral.updated_at = now
+            if timestamp_field:
+                setattr(referral, timestamp_field, now)
+
+        self.session.flush()
+        AuditLog.bulk_insert_copy(self.session, audit_rows)
+        self.session.commit()
+        return len(referrals)
+
     def validate(self, referral_id: int, user: str = "system") -> Optional[Referral]:
         """Move referral to validated status (from intake queue)."""
         return self.update_status(
@@ -246,12 +308,59 @@ class ReferralService:
             .all()
         )
 
+    def get_attachments(self, referral: Referral, include_text: bool = False) -> list[Attachment]:
+        """
+        Get the attachments on a referral's source email.
+
+        Args:
+            referral: The referral
+            include_text: Load locally stored extracted text (deferred by default) in the same query
+        """
+        if not referral.email_id:
+            return []
+
+        query = self.session.query(Attachment).filter(Attachment.email_id == referral.email_id)
+        if include_text:
+            query = query.options(undefer(Attachment.stored_text))
+        return query.order_by(Attachment.id).all()
+
+    def get_uploaded_attachments(self, referral_id: int) -> list[Attachment]:
+        """Get the attachments uploaded directly to a referral."""
+        return (
+            self.session.query(Attachment)
+            .filter(Attachment.referral_id == referral_id)
+            .order_by(Attachment.id)
+            .all()
+        )
+
+    def add_attachments(self, referral_id: int, rows: list[dict]) -> int:
+        """
+        Insert attachment records for a referral in one bulk write.
+
+        Args:
+            referral_id: The referral the attachments belong to
+            rows: Attachment column values (filename, content_type, size_bytes, ...)
+
+        Returns:
+            Number of attachments added
+        """
+        if not rows:
+            return 0
+
+        copy_insert(
+            self.session,
+            Attachment,
+            [{**row, "referral_id": referral_id} for row in rows],
+        )
+        self.session.commit()
+        return len(rows)
+
     def get_audit_log(self, referral_id: int) -> list[AuditLog]:
         """Get the audit history for a referral."""
         return (
             self.session.query(AuditLog)
             .filter(AuditLog.referral_id == referral_id)
-            .order_by(AuditLog.timestamp.desc())
+            .order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
             .all()
         )
 
@@ -269,11 +378,9 @@ class ReferralService:
         log = AuditLog(
             referral_id=referral_id,
             action=action,
-            field_name=field_name,
-            old_value=old_value,
-            new_value=new_value,
+            changes=AuditLog.field_change(field_name, old_value, new_value) if field_name else {},
             user=user or "system",
-            notes=notes,
+            notes=notes[:NOTES_MAX_LENGTH] if notes else notes,
         )
         self.session.add(log)
 
@@ -5,17 +5,22 @@ Provides upload, download, and presigned URL generation.
 
 import json
 import mimetypes
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 from io import BytesIO
 
-from referral_crm.config import get_settings
+from referral_crm.config import get_aws_settings
 
 # Lazy import boto3
 boto3 = None
 botocore = None
 
+# Part size for streamed multipart uploads
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
 
 def get_boto3():
     """Lazily import boto3."""
@@ -44,7 +49,7 @@ class StorageService:
     """
 
     def __init__(self):
-        self.settings = get_settings()
+        self.settings = get_aws_settings()
         self._client = None
 
     @property
@@ -181,17 +186,66 @@ class StorageService:
 
         # Upload extracted text if available
         if extracted_text:
-            text_key = f"{prefix}/attachments/{filename}.txt"
-            self.client.put_object(
-                Bucket=self.bucket,
-                Key=text_key,
-                Body=extracted_text.encode("utf-8"),
-                ContentType="text/plain",
-            )
-            result["text_s3_key"] = text_key
+            result["text_s3_key"] = self._upload_attachment_text(prefix, filename, extracted_text)
 
         return result
 
+    def upload_attachment_fileobj(
+        self,
+        referral_id: int,
+        filename: str,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        extracted_text: Optional[str] = None,
+    ) -> dict:
+        """
+        Stream an attachment to S3 from a file-like object.
+
+        Uses a multipart transfer, so only one part is held in memory at a time.
+
+        Returns:
+            dict with S3 keys
+        """
+        from boto3.s3.transfer import TransferConfig
+
+        prefix = self._get_referral_prefix(referral_id)
+
+        if not content_type:
+            content_type, _ = mimetypes.guess_type(filename)
+            content_type = content_type or "application/octet-stream"
+
+        att_key = f"{prefix}/attachments/{filename}"
+        self.client.upload_fileobj(
+            fileobj,
+            self.bucket,
+            att_key,
+            ExtraArgs={"ContentType": content_type},
+            Config=TransferConfig(
+                multipart_threshold=MULTIPART_CHUNKSIZE,
+                multipart_chunksize=MULTIPART_CHUNKSIZE,
+            ),
+        )
+
+        result = {
+            "filename": filename,
+            "content_type": content_type,
+            "s3_key": att_key,
+        }
+        if extracted_text:
+            result["text_s3_key"] = self._upload_attachment_text(prefix, filename, extracted_text)
+        return result
+
+    def _upload_attachment_text(self, prefix: str, filename: str, extracted_text: str) -> str:
+        """Upload an attachment's extracted text next to it; returns the key."""
+        text_key = f"{prefix}/attachments/{filename}.txt"
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=text_key,
+            Body=extracted_text.encode("utf-8"),
+            ContentType="text/plain",
+        )
+        return text_key
+
     def get_attachment(self, referral_id: int, filename: str) -> Optional[bytes]:
         """Download an attachment from S3."""
         key = f"{self._get_referral_prefix(referral_id)}/attachments/{filename}"
@@ -201,6 +255,21 @@ class StorageService:
         except Exception:
             return None
 
+    def presign_key(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        """
+        Get a presigned GET URL for an already-known S3 key.
+
+        Signing is local, so this makes no request to S3.
+        """
+        try:
+            return self.client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.bucket, "Key": key},
+                ExpiresIn=expires_in,
+            )
+        except Exception:
+            return None
+
     def get_attachment_url(
         self,
         referral_id: int,
@@ -252,6 +321,14 @@ class StorageService:
         except Exception:
             return None
 
+    def get_text(self, key: str) -> Optional[str]:
+        """Get a stored text object (e.g. extracted attachment text) by S3 key."""
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"].read().decode("utf-8")
+        except Exception:
+            return None
+
     def list_attachments(self, referral_id: int) -> list[dict]:
         """List all attachments for a referral."""
         prefix = f"{self._get_referral_prefix(referral_id)}/attachments/"
@@ -400,3 +477,35 @@ def get_storage_service() -> StorageService:
     if _storage_service is None:
         _storage_service = StorageService()
     return _storage_service
+
+
+# In-process cache of S3 text objects (they are never rewritten), least
+# recently used first. Bounded by total size rather than entry count, since
+# OCR text runs to megabytes; mostly-ASCII text is held at a byte per character
+TEXT_CACHE_MAX_CHARS = 32 * 1024 * 1024
+_text_cache: OrderedDict[str, str] = OrderedDict()
+_text_cache_chars = 0
+_text_cache_lock = threading.Lock()
+
+
+def get_cached_text(key: str) -> Optional[str]:
+    """Get a text object from S3, cached in-process. Failed fetches are not cached."""
+    global _text_cache_chars
+    with _text_cache_lock:
+        text = _text_cache.get(key)
+        if text is not None:
+            _text_cache.move_to_end(key)
+            return text
+
+    text = get_storage_service().get_text(key)
+    if text is None or len(text) > TEXT_CACHE_MAX_CHARS:
+        return text
+
+    with _text_cache_lock:
+        if key not in _text_cache:
+            _text_cache[key] = text
+            _text_cache_chars += len(text)
+            while _text_cache_chars > TEXT_CACHE_MAX_CHARS:
+                _, evicted = _text_cache.popitem(last=False)
+                _text_cache_chars -= len(evicted)
+    return text
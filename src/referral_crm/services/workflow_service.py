@@ -11,8 +11,8 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete
+from sqlalchemy.orm import Query, Session, joinedload
 
 from referral_crm.models import (
     Email,
@@ -26,9 +26,17 @@ from referral_crm.models import (
     ReferralLineItem,
     ReferralStatus,
 )
+from referral_crm.models.queue import LAST_ERROR_MAX_LENGTH
 
 logger = logging.getLogger(__name__)
 
+# Queue item statuses that never return to a queue
+FINISHED_ITEM_STATUSES = (
+    QueueItemStatus.COMPLETED,
+    QueueItemStatus.SKIPPED,
+    QueueItemStatus.FAILED,
+)
+
 
 class WorkflowService:
     """
@@ -154,7 +162,7 @@ class WorkflowService:
 
         if queue_item:
             queue_item.status = QueueItemStatus.FAILED
-            queue_item.last_error = error
+            queue_item.last_error = error[:LAST_ERROR_MAX_LENGTH]
             queue_item.completed_at = datetime.utcnow()
 
         email.status = EmailStatus.EXTRACTION_FAILED
@@ -204,11 +212,11 @@ class WorkflowService:
         self.session.add(referral)
         self.session.flush()  # Get referral ID
 
-        # Add line items
+        # Add line items (flushed together as one multi-row INSERT)
         for i, item in enumerate(line_items, start=1):
             item.referral_id = referral.id
             item.line_number = i
-            self.session.add(item)
+        self.session.add_all(line_items)
 
         # Add to intake queue
         intake_queue = self.get_queue(QueueType.INTAKE)
@@ -423,6 +431,7 @@ class WorkflowService:
 
         return (
             self.session.query(QueueItem)
+            .options(self._queue_listing_load())
             .filter(
                 QueueItem.queue_id == queue.id,
                 QueueItem.status == QueueItemStatus.PENDING,
@@ -441,17 +450,7 @@ class WorkflowService:
         if not queue:
             return []
 
-        return (
-            self.session.query(QueueItem)
-            .filter(
-                QueueItem.queue_id == queue.id,
-                QueueItem.status.in_(
-                    [QueueItemStatus.PENDING, QueueItemStatus.IN_PROGRESS]
-                ),
-                QueueItem.due_at < datetime.utcnow(),
-            )
-            .all()
-        )
+        return self._overdue_query(queue).options(self._queue_listing_load()).all()
 
     def get_queue_stats(self, queue_type: QueueType) -> dict:
         """Get statistics for a queue."""
@@ -477,7 +476,7 @@ class WorkflowService:
             .count()
         )
 
-        overdue = len(self.get_overdue_items(queue_type))
+        overdue = self._overdue_query(queue).count()
 
         return {
             "queue_name": queue.name,
@@ -488,10 +487,51 @@ class WorkflowService:
             "sla_minutes": queue.sla_minutes,
         }
 
+    def purge_finished_items(self, older_than: datetime, dry_run: bool = True) -> int:
+        """
+        Delete finished queue items completed before a cutoff.
+
+        Keeps queue_items (and its indexes) down to the working set the
+        dequeue and dashboard queries touch.
+
+        Args:
+            older_than: Only items completed before this time are removed
+            dry_run: If True, only count the matching items
+
+        Returns:
+            Number of items deleted (or that would be deleted)
+        """
+        criteria = (
+            QueueItem.status.in_(FINISHED_ITEM_STATUSES),
+            QueueItem.completed_at < older_than,
+        )
+        if dry_run:
+            return self.session.query(QueueItem).filter(*criteria).count()
+
+        result = self.session.execute(
+            delete(QueueItem).where(*criteria).execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        logger.info(f"Purged {result.rowcount} finished queue items")
+        return result.rowcount
+
     # =========================================================================
     # HELPERS
     # =========================================================================
 
+    def _overdue_query(self, queue: Queue) -> Query:
+        """Open items in a queue that are past their SLA due date."""
+        return self.session.query(QueueItem).filter(
+            QueueItem.queue_id == queue.id,
+            QueueItem.status.in_([QueueItemStatus.PENDING, QueueItemStatus.IN_PROGRESS]),
+            QueueItem.due_at < datetime.utcnow(),
+        )
+
+    @staticmethod
+    def _queue_listing_load():
+        """Loader for queue listings, which show each item's referral and carrier."""
+        return joinedload(QueueItem.referral).joinedload(Referral.carrier)
+
     def _determine_email_priority(self, email: Email) -> Priority:
         """Determine priority based on email content."""
         if not email.subject: